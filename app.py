@@ -1,12 +1,22 @@
 # app.py - Updated with EMA Signal Service
 
 import os
+import atexit
 import logging
 import signal
 import sys
+import threading
 from datetime import datetime
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: no flock, single process anyway
+    fcntl = None
 from flask import Flask
-from flask_cors import CORS
+from json_provider import OrjsonProvider
+from response_cache import ResponseCache
+from compression import register_compression
+from cors import register_cors
+from scrape_jobs import ScrapeJobQueue
 
 # Import services
 from database_service import DatabaseService
@@ -39,6 +49,9 @@ from routes_ema_notification import register_ema_notification_routes
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Only the process holding this lock runs the initial load and the scheduler
+INITIAL_LOAD_LOCK_PATH = os.environ.get('INITIAL_LOAD_LOCK_PATH', '/tmp/ntp_initial_scrape.lock')
+
 
 class NepalStockApp:
     
@@ -53,6 +66,8 @@ class NepalStockApp:
             data_db_path=data_db_path,
             auth_db_path=auth_db_path
         )
+        # Pooled connections stay open between requests; close them on the way out
+        atexit.register(self.db_service.close_all)
         
         # Configuration
         self.flask_host = os.environ.get('FLASK_HOST', '0.0.0.0')
@@ -74,7 +89,8 @@ class NepalStockApp:
         self.scraping_service = EnhancedScrapingService(
             self.price_service, 
             self.ipo_service,
-            index_service=self.index_service
+            index_service=self.index_service,
+            db_service=self.db_service
         )
         logger.info("Scraping service initialized with stock, IPO, and index support")
         
@@ -149,9 +165,18 @@ class NepalStockApp:
         # Add signals service to scheduler for compatibility
         self.smart_scheduler.signals_service = self.technical_signals_service
         
+        # Cache for read-only list endpoints, invalidated by the scheduler after scrapes;
+        # the data version also drives ETags and catches scrapes run in other processes
+        self.response_cache = ResponseCache(data_version=self._data_version)
+        self.smart_scheduler.response_cache = self.response_cache
+        
+        # Manual scrapes run on a single background worker instead of the request thread
+        self.scrape_jobs = ScrapeJobQueue(self.scraping_service, self.db_service, self.response_cache)
+        
         # Create Flask app
         self.app = Flask(__name__)
-        CORS(self.app)
+        self.app.json = OrjsonProvider(self.app)
+        register_cors(self.app)
         
         # Store services in app config
         self.app.config['db_service'] = self.db_service
@@ -170,6 +195,8 @@ class NepalStockApp:
         self.app.config['price_history_service'] = self.price_history_service
         self.app.config['ema_signal_service'] = self.ema_signal_service
         self.app.config['ema_notification_service'] = self.ema_notification_service
+        self.app.config['response_cache'] = self.response_cache
+        self.app.config['scrape_jobs'] = self.scrape_jobs
         
         # Create authentication decorators
         self.require_auth, self.require_admin = create_auth_decorators(self.auth_service)
@@ -184,6 +211,7 @@ class NepalStockApp:
         register_price_history_routes(self.app)
         register_ema_signal_routes(self.app)
         register_ema_notification_routes(self.app)
+        register_compression(self.app)
         
         # Initialize data
         self._initialize_app()
@@ -216,7 +244,41 @@ class NepalStockApp:
         
         # Check for admin keys
         self._ensure_admin_key()
-        
+    
+    def start_background_work(self):
+        """Run the initial data load, then the scheduler, unless another process already does
+        
+        Call this in the process that serves requests (gunicorn's post_worker_init hook or
+        __main__), never in a gunicorn master that is about to fork: a background thread
+        caught mid SQLite/HTTP call would be copied half-finished into every worker.
+        """
+        if not self._acquire_initial_load_lock():
+            logger.info("Initial data load and scheduler run in another process, skipping")
+            return
+        
+        # Scrapes take minutes; serve requests while the initial data loads
+        threading.Thread(target=self._initial_data_load, name='initial-load', daemon=True).start()
+    
+    def _acquire_initial_load_lock(self):
+        """Take the host-wide initial load lock; held until this process exits"""
+        if fcntl is None:
+            return True
+        try:
+            lock_file = open(INITIAL_LOAD_LOCK_PATH, 'w')
+        except OSError as e:
+            logger.warning(f"Could not open initial load lock, loading anyway: {e}")
+            return True
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+        # Keep the file open; closing it would release the lock
+        self._initial_load_lock = lock_file
+        return True
+    
+    def _initial_data_load(self):
+        """Populate the data database, then start the scheduler (runs in a background thread)"""
         # Run initial data scrape (stocks, IPOs, and indices)
         logger.info("Running initial stock, IPO, and market indices data scrape...")
         try:
@@ -228,6 +290,9 @@ class NepalStockApp:
         except Exception as e:
             logger.warning(f"Initial scrape failed: {e}")
         
+        # Drop anything cached from the empty database while the scrape ran
+        self.response_cache.invalidate()
+        
         # Run initial NEPSE history scrape
         logger.info("Running initial NEPSE history scrape...")
         try:
@@ -326,42 +391,51 @@ class NepalStockApp:
         except Exception as e:
             logger.warning(f"Initial price history save failed: {e}")
         
-        # Start intelligent scheduler
+        # Started after the initial load so its first scrape does not overlap it
         try:
             self.smart_scheduler.start()
         except Exception as e:
             logger.error(f"Failed to start intelligent scheduler: {e}")
     
+    def _data_version(self):
+        """Token that changes whenever a scrape writes stocks or issues"""
+        return (self.price_service.get_last_update(), self.ipo_service.get_last_update())
+    
     def _ensure_admin_key(self):
         """Ensure at least one admin key exists in auth database"""
         try:
             conn = self.db_service.get_auth_connection()
             cursor = conn.cursor()
-            cursor.execute('SELECT COUNT(*) FROM api_keys WHERE key_type = "admin" AND is_active = TRUE')
-            admin_count = cursor.fetchone()[0]
+            # Stops at the first active admin key instead of counting them all
+            cursor.execute(
+                'SELECT EXISTS(SELECT 1 FROM api_keys WHERE key_type = ? AND is_active = 1)',
+                ('admin',)
+            )
+            has_admin = bool(cursor.fetchone()[0])
             conn.close()
         except Exception as e:
             logger.info(f"Admin key check failed (tables may not exist yet): {e}")
-            admin_count = 0
+            has_admin = False
         
-        if admin_count == 0:
-            logger.info("No admin keys found, creating initial admin key...")
-            
-            initial_admin = self.auth_service.generate_api_key(
-                key_type='admin',
-                created_by='system',
-                description='Initial admin key (persistent auth DB)'
-            )
-            if initial_admin:
-                logger.info("=" * 60)
-                logger.info("ADMIN KEY CREATED (PERSISTENT AUTH DATABASE):")
-                logger.info(f"Key ID: {initial_admin['key_id']}")
-                logger.info(f"API Key: {initial_admin['api_key']}")
-                logger.info("SAVE THIS KEY SECURELY - IT WON'T BE SHOWN AGAIN!")
-                logger.info("This key will persist across deployments.")
-                logger.info("=" * 60)
-        else:
-            logger.info(f"Found {admin_count} active admin key(s) in persistent auth database")
+        if has_admin:
+            logger.info("Active admin key present in persistent auth database")
+            return
+        
+        logger.info("No admin keys found, creating initial admin key...")
+        
+        initial_admin = self.auth_service.generate_api_key(
+            key_type='admin',
+            created_by='system',
+            description='Initial admin key (persistent auth DB)'
+        )
+        if initial_admin:
+            logger.info("=" * 60)
+            logger.info("ADMIN KEY CREATED (PERSISTENT AUTH DATABASE):")
+            logger.info(f"Key ID: {initial_admin['key_id']}")
+            logger.info(f"API Key: {initial_admin['api_key']}")
+            logger.info("SAVE THIS KEY SECURELY - IT WON'T BE SHOWN AGAIN!")
+            logger.info("This key will persist across deployments.")
+            logger.info("=" * 60)
     
     def run(self):
         """Run the Flask application"""
@@ -390,27 +464,41 @@ class NepalStockApp:
 
 
 # For Gunicorn
+# One NepalStockApp per process; local runs reuse the instance built at import
+_nepal_app = None
+
+
 def create_app():
     """Factory function for Gunicorn"""
+    global _nepal_app
+    if _nepal_app is not None:
+        return _nepal_app.app
+    
     try:
-        nepal_app = NepalStockApp()
+        _nepal_app = NepalStockApp()
         logger.info("Application factory completed successfully")
-        return nepal_app.app
+        return _nepal_app.app
     except Exception as e:
         logger.error(f"Application factory failed: {e}")
         raise
 
 
+def start_background_work():
+    """Gunicorn post_worker_init entry point (see gunicorn.conf.py)"""
+    create_app()
+    _nepal_app.start_background_work()
+
+
 # Create the app instance
 app = create_app()
 
 # For local development
 if __name__ == '__main__':
     try:
-        nepal_app = NepalStockApp()
-        nepal_app.run()
+        _nepal_app.start_background_work()
+        _nepal_app.run()
     except KeyboardInterrupt:
         logger.info("Application stopped by user")
     except Exception as e:
         logger.error(f"Application failed to start: {e}")
-        raise
\ No newline at end of file
+        raise
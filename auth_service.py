@@ -4,17 +4,41 @@ import sqlite3
 import hashlib
 import secrets
 import logging
+import threading
 from datetime import datetime, timedelta
 from functools import wraps
-from flask import request, jsonify
+from time import monotonic
+from flask import current_app, request
 
 logger = logging.getLogger(__name__)
+
+# Seconds a validated key is trusted without re-reading api_keys; revocations
+# made through another worker take at most this long to apply here
+KEY_CACHE_TTL = 60
+KEY_CACHE_SIZE = 10000
+
+# Admin dashboard counters, built once; is_active is stored as SQLite 0/1
+ADMIN_SNAPSHOT_SQL = '''
+    SELECT
+        keys.active,
+        keys.total,
+        (SELECT COUNT(*) FROM api_logs WHERE timestamp >= ?)
+    FROM (
+        SELECT COUNT(CASE WHEN is_active = 1 THEN 1 END) AS active, COUNT(*) AS total
+        FROM api_keys
+    ) AS keys
+'''
+
+
 class AuthService:
     """Handle all authentication, authorization and security operations"""
     
     def __init__(self, db_service):
         """Initialize with DatabaseService"""
         self.db_service = db_service
+        # key_hash -> (expires_at, (key_id, key_type, max_devices)); hashes only, never raw keys
+        self._key_cache = {}
+        self._key_cache_lock = threading.Lock()
         self._init_auth_tables()
     
     def _get_connection(self):
@@ -74,8 +98,12 @@ class AuthService:
         
         # Create indexes
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_api_keys_key_id ON api_keys(key_id)')
+        # Startup admin-key check stops at the first matching entry
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_api_keys_type_active ON api_keys(key_type, is_active)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_device_sessions_key_device ON device_sessions(key_id, device_id)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_api_logs_key_timestamp ON api_logs(key_id, timestamp)')
+        # Time-window counts without a key_id (admin stats, usage/endpoint totals)
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_api_logs_timestamp ON api_logs(timestamp)')
         
         conn.commit()
         conn.close()
@@ -114,6 +142,7 @@ class AuthService:
             deleted_keys = cursor.rowcount
             
             conn.commit()
+            self._forget_key(key_id)
             
             if deleted_keys > 0:
                 logger.info(f"Successfully deleted key {key_id} and {deleted_sessions} associated sessions")
@@ -153,6 +182,7 @@ class AuthService:
             cursor.execute('UPDATE device_sessions SET is_active = FALSE WHERE key_id = ?', (key_id,))
             
             conn.commit()
+            self._forget_key(key_id)
             
             logger.info(f"Deactivated key: {key_id}")
             return cursor.rowcount > 0 or True  # Return True even if no sessions
@@ -257,29 +287,24 @@ class AuthService:
         cursor = conn.cursor()
         
         try:
-            cursor.execute('PRAGMA foreign_keys = ON')
-            cursor.execute('''
-                SELECT key_id, key_type, max_devices, is_active 
-                FROM api_keys 
-                WHERE key_hash = ? AND is_active = TRUE
-            ''', (key_hash,))
-            
-            key_record = cursor.fetchone()
+            key_record = self._lookup_active_key(cursor, key_hash)
             if not key_record:
                 self._log_request(cursor, None, device_id, endpoint, method, 
                                 ip_address, user_agent, 401)
                 conn.commit()
                 return {'valid': False, 'error': 'Invalid API key'}
             
-            key_id, key_type, max_devices, is_active = key_record
+            key_id, key_type, max_devices = key_record
+            # One timestamp for every write this request makes
+            now = datetime.now()
             
             # Update last used timestamp
             cursor.execute('UPDATE api_keys SET last_used = ? WHERE key_id = ?', 
-                          (datetime.now(), key_id))
+                          (now, key_id))
             
             # Handle device session
             session_result = self._manage_device_session(
-                cursor, key_id, device_id, device_info, max_devices
+                cursor, key_id, device_id, device_info, max_devices, now
             )
             
             if not session_result['success']:
@@ -306,28 +331,51 @@ class AuthService:
         finally:
             conn.close()
     
-    def _manage_device_session(self, cursor, key_id, device_id, device_info, max_devices):
-        """Manage device sessions for API key"""
-        cursor.execute('''
-            SELECT COUNT(*) FROM device_sessions 
-            WHERE key_id = ? AND is_active = TRUE
-        ''', (key_id,))
+    def _lookup_active_key(self, cursor, key_hash):
+        """Get (key_id, key_type, max_devices) for an active key hash, cached for KEY_CACHE_TTL"""
+        now = monotonic()
+        entry = self._key_cache.get(key_hash)
+        if entry and entry[0] > now:
+            return entry[1]
         
-        active_devices = cursor.fetchone()[0]
+        cursor.execute('''
+            SELECT key_id, key_type, max_devices
+            FROM api_keys 
+            WHERE key_hash = ? AND is_active = TRUE
+        ''', (key_hash,))
+        key_record = cursor.fetchone()
+        if not key_record:
+            return None
         
+        with self._key_cache_lock:
+            if len(self._key_cache) >= KEY_CACHE_SIZE:
+                self._key_cache = {h: e for h, e in self._key_cache.items() if e[0] > now}
+                if len(self._key_cache) >= KEY_CACHE_SIZE:
+                    self._key_cache.clear()
+            self._key_cache[key_hash] = (now + KEY_CACHE_TTL, key_record)
+        return key_record
+    
+    def _forget_key(self, key_id):
+        """Drop a revoked or deleted key from the validation cache"""
+        with self._key_cache_lock:
+            self._key_cache = {h: e for h, e in self._key_cache.items() if e[1][0] != key_id}
+    
+    def _manage_device_session(self, cursor, key_id, device_id, device_info, max_devices, now):
+        """Manage device sessions for API key"""
+        # Active device count and "is this device one of them" in a single index range read
         cursor.execute('''
-            SELECT id FROM device_sessions 
-            WHERE key_id = ? AND device_id = ? AND is_active = TRUE
-        ''', (key_id, device_id))
+            SELECT COUNT(*), COALESCE(MAX(device_id = ?), 0) FROM device_sessions 
+            WHERE key_id = ? AND is_active = TRUE
+        ''', (device_id, key_id))
         
-        existing_session = cursor.fetchone()
+        active_devices, existing_session = cursor.fetchone()
         
         if existing_session:
             cursor.execute('''
                 UPDATE device_sessions 
                 SET last_activity = ?, device_info = ?
                 WHERE key_id = ? AND device_id = ?
-            ''', (datetime.now(), device_info, key_id, device_id))
+            ''', (now, device_info, key_id, device_id))
             return {'success': True}
         
         if active_devices >= max_devices:
@@ -336,7 +384,7 @@ class AuthService:
         cursor.execute('''
             INSERT INTO device_sessions (key_id, device_id, device_info, last_activity)
             VALUES (?, ?, ?, ?)
-        ''', (key_id, device_id, device_info, datetime.now()))
+        ''', (key_id, device_id, device_info, now))
         
         return {'success': True}
     
@@ -427,6 +475,7 @@ class AuthService:
             cursor.execute('UPDATE api_keys SET is_active = FALSE WHERE key_id = ?', (key_id,))
             cursor.execute('UPDATE device_sessions SET is_active = FALSE WHERE key_id = ?', (key_id,))
             conn.commit()
+            self._forget_key(key_id)
             return cursor.rowcount > 0
         except Exception as e:
             logger.error(f"Error deactivating key {key_id}: {e}")
@@ -483,6 +532,33 @@ class AuthService:
         finally:
             conn.close()
     
+    def get_admin_snapshot(self, days=1):
+        """Get key, session and request counters for the admin dashboard"""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            since_date = datetime.now() - timedelta(days=days)
+            cursor.execute(ADMIN_SNAPSHOT_SQL, (since_date,))
+            active_keys, total_keys, requests = cursor.fetchone()
+            
+            # A failed session count shows as 0 rather than failing the whole dashboard
+            active_sessions = 0
+            try:
+                cursor.execute('SELECT COUNT(*) FROM device_sessions WHERE is_active = 1')
+                active_sessions = cursor.fetchone()[0]
+            except Exception as e:
+                logger.warning(f"Error counting sessions: {e}")
+            
+            return {
+                'active_keys': active_keys,
+                'total_keys': total_keys,
+                'active_sessions': active_sessions,
+                'requests': requests
+            }
+        finally:
+            conn.close()
+    
     def get_endpoint_stats(self, key_id=None, days=7):
         """Get statistics by endpoint"""
         conn = self._get_connection()
@@ -549,6 +625,19 @@ class AuthService:
 def create_auth_decorators(auth_service):
     """Create authentication decorators with dependency injection"""
     
+    # Auth failures carry one of a few fixed messages; encode each body once
+    error_bodies = {}
+    
+    def auth_error(message, status):
+        body = error_bodies.get(message)
+        if body is None:
+            body = error_bodies[message] = current_app.json.response({
+                'success': False,
+                'error': message,
+                'flutter_ready': True
+            }).get_data()
+        return current_app.response_class(body, status=status, mimetype='application/json')
+    
     def require_auth(f):
         """Decorator to require API key authentication"""
         @wraps(f)
@@ -558,11 +647,7 @@ def create_auth_decorators(auth_service):
             device_info = request.headers.get('X-Device-Info', '')
             
             if not api_key or not device_id:
-                return jsonify({
-                    'success': False,
-                    'error': 'API key and device ID are required',
-                    'flutter_ready': True
-                }), 401
+                return auth_error('API key and device ID are required', 401)
             
             validation = auth_service.validate_request(
                 api_key=api_key,
@@ -575,11 +660,7 @@ def create_auth_decorators(auth_service):
             )
             
             if not validation['valid']:
-                return jsonify({
-                    'success': False,
-                    'error': validation['error'],
-                    'flutter_ready': True
-                }), 401
+                return auth_error(validation['error'], 401)
             
             request.auth_info = validation
             return f(*args, **kwargs)
@@ -591,11 +672,7 @@ def create_auth_decorators(auth_service):
         @wraps(f)
         def decorated_function(*args, **kwargs):
             if not hasattr(request, 'auth_info') or request.auth_info.get('key_type') != 'admin':
-                return jsonify({
-                    'success': False,
-                    'error': 'Admin privileges required',
-                    'flutter_ready': True
-                }), 403
+                return auth_error('Admin privileges required', 403)
             return f(*args, **kwargs)
         
         return decorated_function
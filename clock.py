@@ -0,0 +1,21 @@
+# clock.py - Cached wall-clock timestamp for API responses
+
+from datetime import datetime
+from time import time
+
+# Responses within the same tick share one timestamp string
+TICK_SECONDS = 0.25
+
+_now_iso = (0.0, '')  # (expires_at, isoformat string)
+
+
+def now_iso():
+    """Local time as an ISO string, reformatted at most once per tick"""
+    global _now_iso
+    now = time()
+    expires_at, value = _now_iso
+    if now < expires_at:
+        return value
+    value = datetime.fromtimestamp(now).isoformat()
+    _now_iso = (now + TICK_SECONDS, value)
+    return value
@@ -0,0 +1,67 @@
+# compression.py - gzip Content-Encoding for JSON API responses
+
+import gzip
+import logging
+import zlib
+from flask import request
+
+logger = logging.getLogger(__name__)
+
+COMPRESS_MIMETYPES = frozenset({'application/json'})
+COMPRESS_MIN_SIZE = 1024
+COMPRESS_LEVEL = 4
+
+
+def accepts_gzip():
+    """Whether the current request advertises gzip support"""
+    return 'gzip' in request.headers.get('Accept-Encoding', '').lower()
+
+
+def gzip_body(data):
+    """Compress a complete response body (None when it is too small to bother)"""
+    if len(data) < COMPRESS_MIN_SIZE:
+        return None
+    return gzip.compress(data, compresslevel=COMPRESS_LEVEL, mtime=0)
+
+
+def set_gzip_body(response, compressed):
+    """Swap a response body for its gzip-encoded form"""
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+
+def _gzip_stream(chunks):
+    compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def register_compression(app):
+    """Gzip JSON responses for clients that accept it"""
+
+    @app.after_request
+    def compress_response(response):
+        if response.mimetype not in COMPRESS_MIMETYPES:
+            return response
+        response.vary.add('Accept-Encoding')
+
+        if (not 200 <= response.status_code < 300
+                or 'Content-Encoding' in response.headers
+                or not accepts_gzip()):
+            return response
+
+        if response.is_streamed:
+            # Compress chunk by chunk so streamed bodies stay streamed
+            response.response = _gzip_stream(response.iter_encoded())
+            response.headers.pop('Content-Length', None)
+            response.headers['Content-Encoding'] = 'gzip'
+            return response
+
+        compressed = gzip_body(response.get_data())
+        if compressed is not None:
+            set_gzip_body(response, compressed)
+        return response
@@ -0,0 +1,27 @@
+# cors.py - Static CORS headers for the public JSON API
+
+from flask import request
+
+# No cookies or credentials are involved, so a wildcard origin is enough
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*'
+}
+PREFLIGHT_HEADERS = {
+    'Access-Control-Allow-Methods': 'GET, POST, DELETE, OPTIONS',
+    'Access-Control-Max-Age': '600'
+}
+
+
+def register_cors(app):
+    """Add CORS headers to every response and answer preflights"""
+
+    @app.after_request
+    def add_cors_headers(response):
+        response.headers.update(CORS_HEADERS)
+
+        if request.method == 'OPTIONS':
+            response.headers.update(PREFLIGHT_HEADERS)
+            requested = request.headers.get('Access-Control-Request-Headers')
+            if requested:
+                response.headers['Access-Control-Allow-Headers'] = requested
+        return response
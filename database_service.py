@@ -3,9 +3,103 @@
 import sqlite3
 import logging
 import os
+import queue
+from functools import partial
 
 logger = logging.getLogger(__name__)
 
+# Milliseconds a connection waits on a locked database before raising
+BUSY_TIMEOUT_MS = 5000
+
+# Idle connections kept open per database (DB_POOL_SIZE overrides)
+POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 8))
+
+# Compiled statements each pooled connection keeps for reuse (keyed by SQL text)
+STATEMENT_CACHE_SIZE = 256
+
+# Bytes of the data database read through mmap instead of read() syscalls
+DATA_MMAP_SIZE = 256 * 1024 * 1024
+
+
+class PooledConnection(sqlite3.Connection):
+    """SQLite connection that goes back to its pool when closed"""
+    
+    def close(self):
+        pool = getattr(self, '_pool', None)
+        if pool is None:
+            super().close()
+        else:
+            pool.release(self)
+
+
+class ConnectionPool:
+    """Keeps opened SQLite connections for reuse instead of reconnecting per call"""
+    
+    def __init__(self, database, setup, max_size=POOL_SIZE):
+        self.database = database
+        self.setup = setup
+        self.max_size = max_size
+        self._pid = os.getpid()
+        self._idle = queue.LifoQueue(maxsize=max_size)
+        
+        # Bound once; opening a connection skips rebuilding and unpacking kwargs
+        self._connect = partial(
+            sqlite3.connect,
+            database,
+            timeout=BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False,
+            factory=PooledConnection,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+    
+    def acquire(self):
+        """Get an idle connection or open a new one"""
+        if self._pid != os.getpid():
+            # Connections must not cross a fork (gunicorn --preload)
+            self._pid = os.getpid()
+            self._idle = queue.LifoQueue(maxsize=self.max_size)
+        
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+            self.setup(conn)
+            conn._pool = self
+        
+        conn._in_pool = False
+        return conn
+    
+    def release(self, conn):
+        """Return a connection to the pool, discarding any uncommitted work"""
+        if conn._in_pool:
+            return
+        
+        try:
+            conn.rollback()
+            conn._in_pool = True
+            self._idle.put_nowait(conn)
+        except (sqlite3.Error, queue.Full):
+            conn._pool = None
+            conn.close()
+    
+    def close_all(self):
+        """Close the idle connections opened by this process"""
+        if self._pid != os.getpid():
+            # Inherited from the parent across a fork; theirs to close
+            return
+        
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn._pool = None
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.debug(f"Error closing pooled connection to {self.database}: {e}")
+
+
 class DatabaseService:
     """Database service with separate auth, data, and price history databases"""
     
@@ -37,34 +131,53 @@ class DatabaseService:
             os.makedirs(auth_dir, exist_ok=True)
             logger.info(f"Created auth database directory: {auth_dir}")
         
+        self._pools = {
+            'data': ConnectionPool(self.data_db_path, self._setup_data_connection),
+            'auth': ConnectionPool(self.auth_db_path, self._setup_auth_connection)
+        }
+        
         logger.info(f"Database service initialized:")
         logger.info(f"  - Data DB (ephemeral): {self.data_db_path}")
         logger.info(f"  - Auth DB (persistent): {self.auth_db_path}")
     
+    def _setup_data_connection(self, conn):
+        """Apply pragmas once when a data connection is opened"""
+        conn.execute('PRAGMA foreign_keys = ON')
+        # WAL lets API reads proceed while the scheduler is writing
+        conn.execute('PRAGMA journal_mode = WAL')
+        # In WAL mode NORMAL only fsyncs at checkpoints; the data DB is rebuilt on deploy anyway
+        conn.execute('PRAGMA synchronous = NORMAL')
+        # Keep GROUP BY / ORDER BY scratch b-trees off disk
+        conn.execute('PRAGMA temp_store = MEMORY')
+        # Pooled readers share the OS page cache instead of copying pages per connection
+        conn.execute(f'PRAGMA mmap_size = {DATA_MMAP_SIZE}')
+    
+    def _setup_auth_connection(self, conn):
+        """Apply pragmas once when an auth connection is opened"""
+        conn.execute('PRAGMA foreign_keys = ON')
+        # Disable WAL mode to ensure immediate writes to main file
+        conn.execute('PRAGMA journal_mode = DELETE')
+        # Enable synchronous mode for data safety
+        conn.execute('PRAGMA synchronous = FULL')
+        conn.execute('PRAGMA temp_store = MEMORY')
+    
     def get_connection(self, db_type='data'):
         """
-        Get database connection
+        Get pooled database connection; close() returns it to the pool
         
         Args:
             db_type: 'data' for stocks/IPOs/prices, 'auth' for authentication
         """
-        if db_type == 'auth':
-            conn = sqlite3.connect(self.auth_db_path)
-        else:
-            conn = sqlite3.connect(self.data_db_path)
-        
-        conn.execute('PRAGMA foreign_keys = ON')
-        return conn
+        return self._pools['auth' if db_type == 'auth' else 'data'].acquire()
+    
+    def close_all(self):
+        """Close idle pooled connections (called at process exit)"""
+        for pool in self._pools.values():
+            pool.close_all()
     
     def get_auth_connection(self):
         """Convenience method to get auth database connection"""
-        conn = sqlite3.connect(self.auth_db_path)
-        conn.execute('PRAGMA foreign_keys = ON')
-        # Disable WAL mode to ensure immediate writes to main file
-        conn.execute('PRAGMA journal_mode = DELETE')
-        # Enable synchronous mode for data safety
-        conn.execute('PRAGMA synchronous = FULL')
-        return conn
+        return self.get_connection('auth')
     
     def get_data_connection(self):
         """Convenience method to get data database connection"""
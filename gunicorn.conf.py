@@ -0,0 +1,11 @@
+# gunicorn.conf.py - Gunicorn server hooks
+
+
+def post_worker_init(worker):
+    """Start the initial data load and scheduler from a worker, after it has forked
+
+    With --preload the app is built in the master before the fork; background
+    threads started there would only ever run in the master.
+    """
+    from app import start_background_work
+    start_background_work()
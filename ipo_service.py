@@ -1,16 +1,40 @@
 # ipo_service.py - Simplified SQLite-only version
 
+import heapq
+import json
 import sqlite3
 import logging
 from datetime import datetime, timedelta
+from time import monotonic
 
 logger = logging.getLogger(__name__)
 
+# Issue tables and the category label each one is reported under
+ISSUE_TABLES = (('ipos', 'IPO'), ('fpos', 'FPO'), ('rights_dividends', 'Rights'))
+
+# Newest scraped_at across the issue tables; each MAX is read from its scraped_at index
+LAST_UPDATE_SQL = 'SELECT MAX(last) FROM (' + ' UNION ALL '.join(
+    f'SELECT MAX(scraped_at) AS last FROM {table}' for table, _ in ISSUE_TABLES
+) + ')'
+
+# Seconds a computed get_statistics() result is reused
+STATISTICS_TTL = 30
+
+# Upper-cased issue_type values accepted for the rights_dividends table by get_open_issues
+RIGHTS_ISSUE_TYPES = frozenset({'RIGHTS', 'DIVIDEND'})
+
 class IPOService:
     """Service for handling IPO/FPO/Rights share data with separate tables"""
     
     def __init__(self, db_service):
         self.db_service = db_service
+        
+        # (expires_at, get_statistics() result), dropped when the issue tables are saved.
+        # Saves happen only in the worker holding the initial-load lock (it runs the
+        # scheduler); the TTL covers them in the other workers.
+        self._statistics = None
+        self._statistics_generation = 0
+        
         self._create_tables()
     
     def _create_tables(self):
@@ -86,16 +110,19 @@ class IPOService:
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_ipos_share_type ON ipos (share_type)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_ipos_status ON ipos (status)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_ipos_open_date ON ipos (open_date)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_ipos_scraped_at ON ipos (scraped_at)')
             
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_fpos_symbol ON fpos (symbol)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_fpos_share_type ON fpos (share_type)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_fpos_status ON fpos (status)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_fpos_open_date ON fpos (open_date)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_fpos_scraped_at ON fpos (scraped_at)')
             
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_rights_symbol ON rights_dividends (symbol)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_rights_issue_type ON rights_dividends (issue_type)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_rights_status ON rights_dividends (status)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_rights_book_date ON rights_dividends (book_close_date)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_rights_scraped_at ON rights_dividends (scraped_at)')
             
             conn.commit()
             logger.info("Separate IPO/FPO/Rights tables created successfully (SQLite)")
@@ -178,6 +205,8 @@ class IPOService:
                     continue
             
             conn.commit()
+            self._statistics_generation += 1
+            self._statistics = None
             logger.info(f"Saved {saved_count} {issue_type} issues to {table_name} table from {source_name}")
             return saved_count
             
@@ -202,19 +231,72 @@ class IPOService:
         """Get all Rights/Dividend records"""
         return self._get_table_data_formatted('rights_dividends', 'Rights')
     
+    def get_recent_issues(self, category=None, limit=50):
+        """Get the newest issues across all tables (or one category), ranked and limited in SQL"""
+        match = category.upper() if category else None
+        tables = [(table, label) for table, label in ISSUE_TABLES
+                  if match is None or label.upper() == match]
+        if not tables:
+            return []
+        
+        try:
+            conn = self.db_service.get_connection()
+            cursor = conn.cursor()
+            
+            # Rank only (source, id, scraped_at); the tables have different columns.
+            # As a bare compound SELECT, SQLite merges the scraped_at index scans.
+            union = ' UNION ALL '.join(
+                f"SELECT {index} AS src, id, scraped_at FROM {table}"
+                for index, (table, _) in enumerate(tables)
+            )
+            cursor.execute(f'''
+                {union}
+                ORDER BY scraped_at DESC, src, id
+                LIMIT ?
+            ''', (limit,))
+            ranked = cursor.fetchall()
+            
+            ids_by_src = {}
+            for src, row_id, _ in ranked:
+                ids_by_src.setdefault(src, []).append(row_id)
+            
+            rows_by_key = {}
+            for src, ids in ids_by_src.items():
+                table, label = tables[src]
+                # One SQL text per table however many ids, so the statement cache hits
+                cursor.execute(
+                    f"SELECT * FROM {table} WHERE id IN (SELECT value FROM json_each(?))",
+                    (json.dumps(ids),)
+                )
+                for issue in self._format_table_results(cursor.fetchall(), cursor.description, label):
+                    rows_by_key[(src, issue['id'])] = issue
+            
+            return [rows_by_key[(src, row_id)] for src, row_id, _ in ranked
+                    if (src, row_id) in rows_by_key]
+            
+        except Exception as e:
+            logger.error(f"Error getting recent issues: {e}")
+            return []
+        finally:
+            try:
+                conn.close()
+            except:
+                pass
+    
     def get_open_issues(self, issue_type=None):
         """Get currently open issues from all tables"""
         open_issues = []
+        issue_type = issue_type.upper() if issue_type else None
         
-        if not issue_type or issue_type.upper() == 'IPO':
+        if not issue_type or issue_type == 'IPO':
             ipos = self._get_issues_by_status('ipos', 'open', 'IPO')
             open_issues.extend(ipos)
         
-        if not issue_type or issue_type.upper() == 'FPO':
+        if not issue_type or issue_type == 'FPO':
             fpos = self._get_issues_by_status('fpos', 'open', 'FPO')
             open_issues.extend(fpos)
         
-        if not issue_type or issue_type.upper() in ['RIGHTS', 'DIVIDEND']:
+        if not issue_type or issue_type in RIGHTS_ISSUE_TYPES:
             rights = self._get_issues_by_status('rights_dividends', 'open', 'Rights')
             open_issues.extend(rights)
         
@@ -237,7 +319,8 @@ class IPOService:
     def search_issues(self, query, limit=20):
         """Search issues across all tables"""
         results = []
-        search_term = f"%{query.upper()}%"
+        # LIKE is case-insensitive for ASCII, so columns need no per-row UPPER()
+        search_term = f"%{query}%"
         
         try:
             conn = self.db_service.get_connection()
@@ -246,8 +329,8 @@ class IPOService:
             # Search IPOs
             cursor.execute('''
                 SELECT * FROM ipos 
-                WHERE (UPPER(company_name) LIKE ? OR UPPER(symbol) LIKE ?)
-                ORDER BY scraped_at DESC
+                WHERE (company_name LIKE ? OR symbol LIKE ?)
+                ORDER BY scraped_at DESC, id
                 LIMIT ?
             ''', (search_term, search_term, limit))
             
@@ -257,8 +340,8 @@ class IPOService:
             # Search FPOs
             cursor.execute('''
                 SELECT * FROM fpos 
-                WHERE (UPPER(company_name) LIKE ? OR UPPER(symbol) LIKE ?)
-                ORDER BY scraped_at DESC
+                WHERE (company_name LIKE ? OR symbol LIKE ?)
+                ORDER BY scraped_at DESC, id
                 LIMIT ?
             ''', (search_term, search_term, limit))
             
@@ -268,17 +351,15 @@ class IPOService:
             # Search Rights/Dividends
             cursor.execute('''
                 SELECT * FROM rights_dividends 
-                WHERE (UPPER(company_name) LIKE ? OR UPPER(symbol) LIKE ?)
-                ORDER BY scraped_at DESC
+                WHERE (company_name LIKE ? OR symbol LIKE ?)
+                ORDER BY scraped_at DESC, id
                 LIMIT ?
             ''', (search_term, search_term, limit))
             
             rights = self._format_table_results(cursor.fetchall(), cursor.description, 'Rights')
             results.extend(rights)
             
-            results.sort(key=lambda x: x.get('scraped_at', ''), reverse=True)
-            
-            return results[:limit]
+            return heapq.nlargest(limit, results, key=lambda x: x.get('scraped_at') or '')
             
         except Exception as e:
             logger.error(f"Error searching issues: {e}")
@@ -295,7 +376,7 @@ class IPOService:
             conn = self.db_service.get_connection()
             cursor = conn.cursor()
             
-            cursor.execute(f"SELECT * FROM {table_name} ORDER BY scraped_at DESC")
+            cursor.execute(f"SELECT * FROM {table_name} ORDER BY scraped_at DESC, id")
             rows = cursor.fetchall()
             
             return self._format_table_results(rows, cursor.description, issue_category)
@@ -318,7 +399,7 @@ class IPOService:
             cursor.execute(f'''
                 SELECT * FROM {table_name} 
                 WHERE status = ? 
-                ORDER BY scraped_at DESC
+                ORDER BY scraped_at DESC, id
             ''', (status,))
             
             rows = cursor.fetchall()
@@ -374,8 +455,36 @@ class IPOService:
         
         return results
     
+    def get_last_update(self):
+        """Timestamp of the most recently scraped issue, or None"""
+        try:
+            conn = self.db_service.get_connection()
+            cursor = conn.cursor()
+            cursor.execute(LAST_UPDATE_SQL)
+            return cursor.fetchone()[0]
+        except Exception as e:
+            logger.error(f"Error getting last issue update: {e}")
+            return None
+        finally:
+            try:
+                conn.close()
+            except:
+                pass
+    
     def get_statistics(self):
-        """Get statistics about all tables"""
+        """Get statistics about all tables (recomputed only after the tables change)"""
+        cached = self._statistics
+        if cached is not None and cached[0] > monotonic():
+            return cached[1]
+        
+        generation = self._statistics_generation
+        stats = self._query_statistics()
+        # Don't keep a result that raced a save, or an error placeholder
+        if 'error' not in stats and generation == self._statistics_generation:
+            self._statistics = (monotonic() + STATISTICS_TTL, stats)
+        return stats
+    
+    def _query_statistics(self):
         try:
             conn = self.db_service.get_connection()
             cursor = conn.cursor()
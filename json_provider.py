@@ -0,0 +1,67 @@
+# json_provider.py - orjson-backed JSON provider for Flask responses
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+# Rows encoded per chunk when streaming large lists
+STREAM_BATCH_SIZE = 64
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Serialize jsonify() responses with orjson while keeping Flask's output conventions"""
+
+    # Sorted keys match Flask's default; datetimes fall through to Flask's HTTP-date encoding
+    option = (
+        orjson.OPT_SORT_KEYS
+        | orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_SERIALIZE_NUMPY
+    )
+
+    def _encode(self, obj, indent=False, option=0):
+        option |= self.option
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj, **kwargs):
+        """Serialize obj to a JSON string (indent is honoured for debug output)"""
+        return self._encode(obj, kwargs.get('indent')).decode()
+
+    def response(self, *args, **kwargs):
+        """Build a jsonify() response straight from orjson's bytes, skipping str round-trips"""
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = self._encode(obj, indent, orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+    def stream(self, payload, list_key, batch_size=STREAM_BATCH_SIZE):
+        """Like response(payload), but encodes payload[list_key] in batches as the body is sent"""
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return self.response(payload)
+        return self._app.response_class(self._stream_chunks(payload, list_key, batch_size),
+                                        mimetype=self.mimetype)
+
+    def _stream_chunks(self, payload, list_key, batch_size):
+        # Keys are emitted in sorted order so the bytes match response()
+        separator = b'{'
+        for key in sorted(payload):
+            yield separator + self._encode(key) + b':'
+            separator = b','
+            if key != list_key:
+                yield self._encode(payload[key])
+                continue
+            rows = payload[key]
+            if not rows:
+                yield b'[]'
+                continue
+            prefix = b'['
+            for start in range(0, len(rows), batch_size):
+                yield prefix + b','.join(self._encode(row) for row in rows[start:start + batch_size])
+                prefix = b','
+            yield b']'
+        yield b'}\n' if payload else b'{}\n'
+
+    def loads(self, s, **kwargs):
+        """Parse JSON request bodies"""
+        return orjson.loads(s)
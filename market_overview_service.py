@@ -1,5 +1,6 @@
 # market_overview_service.py - Calculate and store market overview snapshots
 
+import heapq
 import logging
 from datetime import datetime, timedelta
 import json
@@ -176,8 +177,11 @@ class MarketOverviewService:
     
     def _get_top_gainers(self, stocks, limit=10):
         """Get top gaining stocks"""
-        gainers = [s for s in stocks if s.get('change', 0) > 0]
-        gainers.sort(key=lambda x: float(x.get('change_percent', 0)), reverse=True)
+        gainers = heapq.nlargest(
+            limit,
+            (s for s in stocks if s.get('change', 0) > 0),
+            key=lambda x: float(x.get('change_percent', 0))
+        )
         
         return [
             {
@@ -188,13 +192,16 @@ class MarketOverviewService:
                 'change': float(s.get('change', 0)),
                 'change_percent': float(s.get('change_percent', 0))
             }
-            for i, s in enumerate(gainers[:limit])
+            for i, s in enumerate(gainers)
         ]
     
     def _get_top_losers(self, stocks, limit=10):
         """Get top losing stocks"""
-        losers = [s for s in stocks if s.get('change', 0) < 0]
-        losers.sort(key=lambda x: float(x.get('change_percent', 0)))
+        losers = heapq.nsmallest(
+            limit,
+            (s for s in stocks if s.get('change', 0) < 0),
+            key=lambda x: float(x.get('change_percent', 0))
+        )
         
         return [
             {
@@ -205,16 +212,12 @@ class MarketOverviewService:
                 'change': float(s.get('change', 0)),
                 'change_percent': float(s.get('change_percent', 0))
             }
-            for i, s in enumerate(losers[:limit])
+            for i, s in enumerate(losers)
         ]
     
     def _get_top_quantity(self, stocks, limit=10):
         """Get most active stocks by quantity"""
-        active = sorted(
-            stocks,
-            key=lambda x: int(x.get('qty', 0)),
-            reverse=True
-        )
+        active = heapq.nlargest(limit, stocks, key=lambda x: int(x.get('qty', 0)))
         
         return [
             {
@@ -225,16 +228,12 @@ class MarketOverviewService:
                 'qty': int(s.get('qty', 0)),
                 'turnover': float(s.get('turnover', 0))
             }
-            for i, s in enumerate(active[:limit])
+            for i, s in enumerate(active)
         ]
     
     def _get_top_turnover(self, stocks, limit=10):
         """Get most active stocks by turnover"""
-        active = sorted(
-            stocks,
-            key=lambda x: float(x.get('turnover', 0)),
-            reverse=True
-        )
+        active = heapq.nlargest(limit, stocks, key=lambda x: float(x.get('turnover', 0)))
         
         return [
             {
@@ -245,7 +244,7 @@ class MarketOverviewService:
                 'turnover': float(s.get('turnover', 0)),
                 'qty': int(s.get('qty', 0))
             }
-            for i, s in enumerate(active[:limit])
+            for i, s in enumerate(active)
         ]
     
     def save_overview_snapshot(self, overview_data=None, limit=10):
@@ -1,10 +1,10 @@
 # price_history_service.py - Persistent 30 Traded Days Price History
 
-import sqlite3
 import logging
 import os
 from datetime import datetime
 from pathlib import Path
+from database_service import ConnectionPool
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +21,7 @@ class PriceHistoryService:
         """Initialize with database service"""
         self.db_service = db_service
         self.history_db_path = self._get_history_db_path()
+        self._pool = ConnectionPool(self.history_db_path, self._setup_history_connection)
         self._init_history_tables()
     
     def _get_history_db_path(self):
@@ -45,15 +46,17 @@ class PriceHistoryService:
         
         return history_path
     
-    def _get_history_connection(self):
-        """Get connection to persistent history database"""
-        conn = sqlite3.connect(self.history_db_path)
+    def _setup_history_connection(self, conn):
+        """Apply pragmas once when a history connection is opened"""
         conn.execute('PRAGMA foreign_keys = ON')
         # Disable WAL mode to ensure immediate writes
         conn.execute('PRAGMA journal_mode = DELETE')
         # Enable synchronous mode for data safety
         conn.execute('PRAGMA synchronous = FULL')
-        return conn
+    
+    def _get_history_connection(self):
+        """Get pooled connection to persistent history database; close() returns it to the pool"""
+        return self._pool.acquire()
     
     def _init_history_tables(self):
         """Initialize price history tables in persistent database"""
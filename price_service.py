@@ -3,9 +3,13 @@
 import sqlite3
 import logging
 from datetime import datetime, timedelta, time, timezone
+from time import monotonic
 
 logger = logging.getLogger(__name__)
 
+# Seconds a get_stock_count() result is reused
+STOCK_COUNT_TTL = 30
+
 class PriceService:
     """Handle all stock price data operations and market information"""
     
@@ -13,6 +17,12 @@ class PriceService:
         """Initialize with DatabaseService"""
         self.db_service = db_service
         self.market_hours = MarketHours()
+        
+        # (expires_at, latest stock count), replaced whenever this process saves prices.
+        # Saves happen only in the worker holding the initial-load lock (it runs the
+        # scheduler); the TTL covers them in the other workers.
+        self._stock_count = None
+        
         self._init_price_tables()
     
     def _get_connection(self):
@@ -154,6 +164,8 @@ class PriceService:
                 ''', (total_turnover, total_trades, saved_count, advancing, declining, unchanged))
             
             conn.commit()
+            # Every saved row is now the only is_latest row for the table
+            self._stock_count = (monotonic() + STOCK_COUNT_TTL, saved_count)
             logger.info(f"Saved {saved_count}/{len(stock_data_list)} stocks from {source_name}")
             return saved_count
             
@@ -179,20 +191,24 @@ class PriceService:
         
         return True
     
-    def get_all_stocks(self):
-        """Get all latest stock data"""
+    def get_all_stocks(self, limit=None):
+        """Get all latest stock data (optionally only the first `limit` symbols)"""
         conn = self._get_connection()
         cursor = conn.cursor()
         
         try:
-            cursor.execute('''
+            query = '''
                 SELECT symbol, company_name, ltp, change_val, change_percent, 
                        high, low, open_price, prev_close, qty, turnover, 
                        trades, source, timestamp
                 FROM stocks 
                 WHERE is_latest = TRUE
                 ORDER BY symbol
-            ''')
+            '''
+            if limit is None:
+                cursor.execute(query)
+            else:
+                cursor.execute(query + ' LIMIT ?', (limit,))
             
             columns = ['symbol', 'company_name', 'ltp', 'change', 'change_percent', 
                       'high', 'low', 'open_price', 'prev_close', 'qty', 'turnover', 
@@ -406,17 +422,39 @@ class PriceService:
             conn.close()
     
     def get_stock_count(self):
-        """Get total number of stocks"""
+        """Get total number of stocks (counted again only after a save or the TTL)"""
+        cached = self._stock_count
+        if cached is not None and cached[0] > monotonic():
+            return cached[1]
+        
         conn = self._get_connection()
         cursor = conn.cursor()
         
         try:
             cursor.execute('SELECT COUNT(*) FROM stocks WHERE is_latest = TRUE')
-            return cursor.fetchone()[0]
+            count = cursor.fetchone()[0]
         except:
             return 0
         finally:
             conn.close()
+        
+        self._stock_count = (monotonic() + STOCK_COUNT_TTL, count)
+        return count
+    
+    def get_last_update(self):
+        """Timestamp of the newest stock row, or None"""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            # Answered from the end of idx_stocks_timestamp
+            cursor.execute('SELECT MAX(timestamp) FROM stocks')
+            return cursor.fetchone()[0]
+        except Exception as e:
+            logger.error(f"Error getting last stock update: {e}")
+            return None
+        finally:
+            conn.close()
     
     def get_price_history(self, symbol, days=30):
         """Get price history for a stock"""
@@ -464,7 +502,7 @@ class MarketHours:
         self.market_close_time = time(15, 0)
         
         # Trading days (0=Monday, 6=Sunday)
-        self.trading_days = [6, 0, 1, 2, 3]  # Sunday to Thursday
+        self.trading_days = frozenset((6, 0, 1, 2, 3))  # Sunday to Thursday
     
     def get_nepal_time(self):
         """Get current Nepal time"""
@@ -499,7 +537,7 @@ class MarketHours:
             return {
                 'status': 'closed',
                 'reason': 'Not a trading day',
-                'next_open': self._next_market_open().isoformat()
+                'next_open': self._next_market_open(now).isoformat()
             }
         
         if self.is_market_hours(now):
@@ -520,12 +558,13 @@ class MarketHours:
             return {
                 'status': 'after_hours',
                 'reason': 'After market hours',
-                'next_open': self._next_market_open().isoformat()
+                'next_open': self._next_market_open(now).isoformat()
             }
     
-    def _next_market_open(self):
+    def _next_market_open(self, now=None):
         """Get the next market opening time"""
-        now = self.get_nepal_time()
+        if now is None:
+            now = self.get_nepal_time()
         
         if self.is_market_open(now):
             return now
@@ -0,0 +1,22 @@
+# request_args.py - Shared query-string parsing for route handlers
+
+from flask import abort, request
+
+
+def parse_int_arg(name, default, cap=None):
+    """Read a non-negative integer ?name=, falling back to default and never exceeding cap (if given)
+
+    A malformed value aborts with 400.
+    """
+    raw = request.args.get(name)
+    if not raw:
+        return default
+    if not raw.isdecimal():
+        abort(400, description=f'{name} must be a non-negative integer')
+    value = int(raw)
+    return value if cap is None else min(value, cap)
+
+
+def parse_limit(default, cap=None):
+    """Read ?limit=, falling back to default and never exceeding cap (if given)"""
+    return parse_int_arg('limit', default, cap)
@@ -0,0 +1,141 @@
+# response_cache.py - In-process TTL cache for serialized JSON responses
+
+import hashlib
+import logging
+import threading
+from functools import wraps
+from time import monotonic
+from flask import current_app, request
+from compression import accepts_gzip, gzip_body, set_gzip_body
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_TTL = 30
+RESPONSE_CACHE_SIZE = 256
+
+# Seconds the data version token is reused before the database is asked again
+DATA_VERSION_TTL = 5
+
+
+class ResponseCache:
+    """Caches encoded JSON responses and service results for read-only endpoints
+
+    With a data_version callable (returning a token that changes whenever a
+    scrape writes new data), cached responses carry a weak ETag, matching
+    If-None-Match requests get 304, and entries from an older version are
+    never served, even if the scrape ran in another process.
+    """
+
+    def __init__(self, ttl=RESPONSE_CACHE_TTL, maxsize=RESPONSE_CACHE_SIZE, data_version=None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.data_version = data_version
+        # (epoch, version, path, args) -> (expires_at, (body, gzipped body or None))
+        # (epoch, 'data', key) -> (expires_at, value)
+        self._entries = {}
+        self._epoch = 0
+        self._version = (0.0, None)  # (expires_at, token)
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Drop every cached response (called after new data has been scraped)"""
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self._version = (0.0, None)
+        logger.debug(f"Response cache invalidated (epoch {self._epoch})")
+
+    def memoize(self, key, compute, ttl=None):
+        """Return compute() for a data key, reusing a value stored within the TTL (or ttl seconds)"""
+        epoch = self._epoch
+        cache_key = (epoch, 'data', key)
+        now = monotonic()
+
+        entry = self._entries.get(cache_key)
+        if entry and entry[0] > now:
+            return entry[1]
+
+        value = compute()
+        self._store(cache_key, epoch, now, value, ttl)
+        return value
+
+    def cached(self, view):
+        """Decorator serving a view from cache; place it below require_auth"""
+        @wraps(view)
+        def decorated_function(*args, **kwargs):
+            epoch = self._epoch
+            now = monotonic()
+            version = self._current_version(now)
+            request_args = tuple(sorted(request.args.items(multi=True)))
+            key = (epoch, version, request.path, request_args)
+
+            etag = self._etag(version, request_args)
+            if etag is not None and request.if_none_match.contains_weak(etag):
+                response = self._not_modified(etag)
+                response.cache_control.private = True
+                response.cache_control.max_age = self.ttl
+                return response
+
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                body, compressed = entry[1]
+                response = current_app.response_class(body, mimetype='application/json')
+                return self._encode(response, compressed, entry[0] - now, etag)
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code == 200 and response.is_json:
+                # Compressed once here so cache hits never re-gzip the same body
+                compressed = gzip_body(response.get_data())
+                self._store(key, epoch, now, (response.get_data(), compressed))
+                return self._encode(response, compressed, self.ttl, etag)
+            return response
+
+        return decorated_function
+
+    def _etag(self, version, request_args):
+        if version is None:
+            return None
+        tag = repr((version, request.path, request_args)).encode()
+        return hashlib.blake2b(tag, digest_size=8).hexdigest()
+
+    def _current_version(self, now):
+        if self.data_version is None:
+            return None
+        expires_at, token = self._version
+        if expires_at > now:
+            return token
+        try:
+            token = str(self.data_version())
+        except Exception as e:
+            logger.warning(f"Could not read data version: {e}")
+            token = None
+        self._version = (now + DATA_VERSION_TTL, token)
+        return token
+
+    def _not_modified(self, etag):
+        response = current_app.response_class(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+
+    def _encode(self, response, compressed, max_age, etag=None):
+        if compressed is not None and accepts_gzip():
+            set_gzip_body(response, compressed)
+        if etag is not None:
+            # Weak: the gzip and identity bodies share one tag
+            response.set_etag(etag, weak=True)
+        # Clients may reuse the body for as long as this process would; private
+        # because every cached endpoint sits behind an API key
+        response.cache_control.private = True
+        response.cache_control.max_age = int(max_age)
+        return response
+
+    def _store(self, key, epoch, now, value, ttl=None):
+        with self._lock:
+            # A scrape finished while this response was being built
+            if epoch != self._epoch:
+                return
+            if len(self._entries) >= self.maxsize:
+                self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+                while len(self._entries) >= self.maxsize:
+                    del self._entries[next(iter(self._entries))]
+            self._entries[key] = (now + (self.ttl if ttl is None else ttl), value)
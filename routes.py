@@ -1,11 +1,19 @@
 # routes.py - API Routes Registration (Main Entry Point)
 
 import logging
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from flask import jsonify, request
+from clock import now_iso
 
 logger = logging.getLogger(__name__)
 
+# Runs the independent database lookups behind /api/health concurrently
+_health_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='health-check')
+
+# Seconds a /api/health snapshot is reused; the timestamp is still per request
+HEALTH_SNAPSHOT_TTL = 5
+
 
 def register_all_routes(app):
     """Register all API routes"""
@@ -20,53 +28,68 @@ def register_all_routes(app):
     require_auth = app.config['require_auth']
     require_admin = app.config['require_admin']
     
+    # Get services from app config
+    price_service = app.config['price_service']
+    ipo_service = app.config['ipo_service']
+    scraping_service = app.config['scraping_service']
+    smart_scheduler = app.config['smart_scheduler']
+    push_service = app.config['push_service']
+    db_service = app.config['db_service']
+    response_cache = app.config['response_cache']
+    
     # ==================== HEALTH AND STATUS ROUTES ====================
     
+    health_lock = threading.Lock()
+    
+    def build_health_snapshot():
+        """Gather the service lookups behind /api/health"""
+        stock_count_future = _health_executor.submit(price_service.get_stock_count)
+        ipo_stats_future = _health_executor.submit(ipo_service.get_statistics)
+        scheduler_status_future = _health_executor.submit(smart_scheduler.get_scheduler_status)
+        device_count_future = _health_executor.submit(push_service.get_device_count)
+        
+        market_status = price_service.get_market_status()
+        last_scrape = scraping_service.get_last_scrape_time()
+        last_ipo_scrape = scraping_service.get_last_ipo_scrape_time()
+        
+        stock_count = stock_count_future.result()
+        ipo_stats = ipo_stats_future.result()
+        scheduler_status = scheduler_status_future.result()
+        
+        push_stats = {
+            'fcm_initialized': push_service.fcm_initialized,
+            'active_devices': device_count_future.result()
+        }
+        
+        return {
+            'success': True,
+            'status': 'healthy',
+            'platform': 'Local',
+            'database': {
+                'type': 'sqlite',
+                'path': db_service.db_path
+            },
+            'stock_count': stock_count,
+            'ipo_statistics': ipo_stats['summary'],
+            'ipo_by_category': ipo_stats['by_category'],
+            'market_status': market_status,
+            'scheduler_status': scheduler_status,
+            'push_notification_status': push_stats,
+            'last_stock_scrape': last_scrape.isoformat() if last_scrape else None,
+            'last_ipo_scrape': last_ipo_scrape.isoformat() if last_ipo_scrape else None,
+            'flutter_ready': True
+        }
+    
     @app.route('/api/health', methods=['GET'])
     def health_check():
         """Health check endpoint with scheduler status"""
         try:
-            services = {
-                'price_service': app.config['price_service'],
-                'ipo_service': app.config['ipo_service'],
-                'scraping_service': app.config['scraping_service'],
-                'smart_scheduler': app.config['smart_scheduler'],
-                'push_service': app.config['push_service'],
-                'db_service': app.config['db_service']
-            }
+            # Probes arrive far more often than the data changes; one rebuild at a time
+            with health_lock:
+                snapshot = response_cache.memoize(('health',), build_health_snapshot,
+                                                  ttl=HEALTH_SNAPSHOT_TTL)
             
-            stock_count = services['price_service'].get_stock_count()
-            market_status = services['price_service'].get_market_status()
-            last_scrape = services['scraping_service'].get_last_scrape_time()
-            last_ipo_scrape = services['scraping_service'].get_last_ipo_scrape_time()
-            
-            ipo_stats = services['ipo_service'].get_statistics()
-            scheduler_status = services['smart_scheduler'].get_scheduler_status()
-            
-            push_stats = {
-                'fcm_initialized': services['push_service'].fcm_initialized,
-                'active_devices': services['push_service'].get_device_count()
-            }
-            
-            return jsonify({
-                'success': True,
-                'status': 'healthy',
-                'platform': 'Local',
-                'database': {
-                    'type': 'sqlite',
-                    'path': services['db_service'].db_path
-                },
-                'stock_count': stock_count,
-                'ipo_statistics': ipo_stats['summary'],
-                'ipo_by_category': ipo_stats['by_category'],
-                'market_status': market_status,
-                'scheduler_status': scheduler_status,
-                'push_notification_status': push_stats,
-                'last_stock_scrape': last_scrape.isoformat() if last_scrape else None,
-                'last_ipo_scrape': last_ipo_scrape.isoformat() if last_ipo_scrape else None,
-                'timestamp': datetime.now().isoformat(),
-                'flutter_ready': True
-            })
+            return jsonify({**snapshot, 'timestamp': now_iso()})
         except Exception as e:
             logger.error(f"Health check error: {e}")
             return jsonify({
@@ -77,73 +100,48 @@ def register_all_routes(app):
             }), 500
     
     @app.route('/api/scheduler/status', methods=['GET'])
-    @app.config['require_auth']
+    @require_auth
     def get_scheduler_status():
         """Get detailed scheduler status"""
-        try:
-            smart_scheduler = app.config['smart_scheduler']
-            status = smart_scheduler.get_scheduler_status()
-            return jsonify({
-                'success': True,
-                'scheduler_status': status,
-                'timestamp': datetime.now().isoformat(),
-                'flutter_ready': True
-            })
-        except Exception as e:
-            return jsonify({
-                'success': False,
-                'error': str(e),
-                'flutter_ready': True
-            }), 500
+        status = smart_scheduler.get_scheduler_status()
+        return jsonify({
+            'success': True,
+            'scheduler_status': status,
+            'timestamp': now_iso(),
+            'flutter_ready': True
+        })
     
     @app.route('/api/market-status', methods=['GET'])
     def get_market_status():
         """Get market status endpoint"""
-        try:
-            services = {
-                'price_service': app.config['price_service'],
-                'smart_scheduler': app.config['smart_scheduler']
-            }
-            
-            market_status = services['price_service'].get_market_status()
-            nepal_time = services['smart_scheduler']._get_current_nepal_time()
-            
-            enhanced_status = {
-                **market_status,
-                'nepal_time': nepal_time.isoformat(),
-                'is_market_day': services['smart_scheduler']._is_market_day(nepal_time),
-                'is_market_hours': services['smart_scheduler']._is_market_hours(nepal_time),
-                'should_be_open': services['smart_scheduler']._is_market_open(nepal_time)
-            }
-            
-            return jsonify({
-                'success': True,
-                'market_status': enhanced_status,
-                'timestamp': datetime.now().isoformat(),
-                'flutter_ready': True
-            })
-        except Exception as e:
-            return jsonify({
-                'success': False,
-                'error': str(e),
-                'flutter_ready': True
-            }), 500
+        market_status = price_service.get_market_status()
+        nepal_time = smart_scheduler._get_current_nepal_time()
+        
+        enhanced_status = {
+            **market_status,
+            'nepal_time': nepal_time.isoformat(),
+            'is_market_day': smart_scheduler._is_market_day(nepal_time),
+            'is_market_hours': smart_scheduler._is_market_hours(nepal_time),
+            'should_be_open': smart_scheduler._is_market_open(nepal_time)
+        }
+        
+        return jsonify({
+            'success': True,
+            'market_status': enhanced_status,
+            'timestamp': now_iso(),
+            'flutter_ready': True
+        })
     
     # ==================== REGISTER SPECIALIZED ROUTE MODULES ====================
     
-    logger.info("Registering stock routes...")
-    register_stock_routes(app)
-    
-    logger.info("Registering issue routes...")
-    register_issue_routes(app)
-    
-    logger.info("Registering push notification routes...")
-    register_push_notification_routes(app)
-    
-    logger.info("Registering admin routes...")
-    register_admin_routes(app)
-    
-    logger.info("Registering error handlers...")
-    register_error_handlers(app)
+    for description, register in (
+        ('stock routes', register_stock_routes),
+        ('issue routes', register_issue_routes),
+        ('push notification routes', register_push_notification_routes),
+        ('admin routes', register_admin_routes),
+        ('error handlers', register_error_handlers)
+    ):
+        logger.info(f"Registering {description}...")
+        register(app)
     
     logger.info("All routes registered successfully")
\ No newline at end of file
@@ -1,7 +1,8 @@
 # routes_ema_notifications.py - API Routes for EMA Signal Notifications
 
-from flask import jsonify, request
+from flask import jsonify
 import logging
+from request_args import parse_limit
 
 logger = logging.getLogger(__name__)
 
@@ -102,6 +103,8 @@ def register_ema_notification_routes(app):
         Query params:
         - limit: Number of records to return (default: 50)
         """
+        limit = parse_limit(50)
+        
         try:
             if not ema_notification_service:
                 return jsonify({
@@ -109,7 +112,6 @@ def register_ema_notification_routes(app):
                     'error': 'EMA notification service not available'
                 }), 503
             
-            limit = request.args.get('limit', 50, type=int)
             history = ema_notification_service.get_notification_history(limit=limit)
             
             return jsonify({
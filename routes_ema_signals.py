@@ -2,6 +2,7 @@
 
 from flask import jsonify, request
 import logging
+from request_args import parse_limit
 
 logger = logging.getLogger(__name__)
 
@@ -165,8 +166,9 @@ def register_ema_signal_routes(app):
             "data": [...]
         }
         """
+        limit = parse_limit(100)
+        
         try:
-            limit = request.args.get('limit', 100, type=int)
             crossovers_only = request.args.get('crossovers_only', 'false').lower() == 'true'
             
             signals = ema_signal_service.get_all_signals(limit=limit, crossovers_only=crossovers_only)
@@ -201,8 +203,9 @@ def register_ema_signal_routes(app):
             "data": [...]
         }
         """
+        limit = parse_limit(50)
+        
         try:
-            limit = request.args.get('limit', 50, type=int)
             signals = ema_signal_service.get_all_signals(limit=limit, crossovers_only=True)
             
             return jsonify({
@@ -3,6 +3,7 @@
 from flask import Blueprint, jsonify, request, current_app
 from datetime import datetime, timedelta
 import logging
+from request_args import parse_int_arg, parse_limit
 
 logger = logging.getLogger(__name__)
 
@@ -69,10 +70,9 @@ def get_latest_overview():
 @market_overview_bp.route('/top-gainers', methods=['GET'])
 def get_top_gainers():
     """Get latest top gainers list"""
+    limit = parse_limit(10, 20)
+    
     try:
-        limit = request.args.get('limit', 10, type=int)
-        limit = min(limit, 20)  # Cap at 20
-        
         service = get_overview_service()
         overview = service.get_latest_overview()
         
@@ -102,10 +102,9 @@ def get_top_gainers():
 @market_overview_bp.route('/top-losers', methods=['GET'])
 def get_top_losers():
     """Get latest top losers list"""
+    limit = parse_limit(10, 20)
+    
     try:
-        limit = request.args.get('limit', 10, type=int)
-        limit = min(limit, 20)
-        
         service = get_overview_service()
         overview = service.get_latest_overview()
         
@@ -141,10 +140,10 @@ def get_top_active():
         - sort_by: 'quantity' or 'turnover' (default: turnover)
         - limit: number of items (default: 10)
     """
+    limit = parse_limit(10, 20)
+    
     try:
         sort_by = request.args.get('sort_by', 'turnover', type=str)
-        limit = request.args.get('limit', 10, type=int)
-        limit = min(limit, 20)
         
         service = get_overview_service()
         overview = service.get_latest_overview()
@@ -218,11 +217,10 @@ def get_overview_history():
         - hours: last N hours (default: 24)
         - limit: max snapshots (default: 50)
     """
+    limit = parse_limit(50, 200)
+    hours = parse_int_arg('hours', 24)
+    
     try:
-        hours = request.args.get('hours', 24, type=int)
-        limit = request.args.get('limit', 50, type=int)
-        limit = min(limit, 200)
-        
         end_time = datetime.now()
         start_time = end_time - timedelta(hours=hours)
         
@@ -73,10 +73,11 @@ def register_price_history_routes(app):
             
             stats = price_history_service.get_all_symbols_stats()
             
-            return jsonify({
+            # One entry per listed symbol; encode the list as it is sent
+            return app.json.stream({
                 'total_symbols': len(stats),
                 'symbols': stats
-            }), 200
+            }, 'symbols'), 200
         
         except Exception as e:
             logger.error(f"Error getting all history stats: {e}")
@@ -1,198 +1,150 @@
 # routes_stock.py - Stock Routes
 
 import logging
-from datetime import datetime
 from flask import jsonify, request
+from flask.views import MethodView
+from clock import now_iso
+from request_args import parse_limit
 
 logger = logging.getLogger(__name__)
 
 
+class RankedStocksView(MethodView):
+    """Top-N stock list (gainers, losers or most active)"""
+    
+    init_every_request = False
+    
+    def __init__(self, fetch, category):
+        self.fetch = fetch
+        self.category = category
+    
+    def get(self):
+        limit = parse_limit(10, 50)
+        
+        data = self.fetch(limit)
+        
+        return jsonify({
+            'success': True,
+            'data': data,
+            'count': len(data),
+            'category': self.category,
+            'timestamp': now_iso(),
+            'flutter_ready': True
+        })
+
+
 def register_stock_routes(app):
     """Register stock-related routes"""
     
     # Get decorators from app config
     require_auth = app.config['require_auth']
+    response_cache = app.config['response_cache']
+    
+    # Get services from app config
+    price_service = app.config['price_service']
+    scraping_service = app.config['scraping_service']
     
     @app.route('/api/stocks', methods=['GET'])
     @require_auth
     def get_stocks():
         """Get all stock data"""
-        try:
-            services = {
-                'price_service': app.config['price_service'],
-                'scraping_service': app.config['scraping_service']
-            }
-            
-            symbol = request.args.get('symbol')
-            
-            if symbol:
-                data = services['price_service'].get_stock_by_symbol(symbol)
-                if not data:
-                    return jsonify({
-                        'success': False,
-                        'error': 'Stock not found',
-                        'flutter_ready': True
-                    }), 404
-                data = [data]
-            else:
-                data = services['price_service'].get_all_stocks()
-            
-            market_status = services['price_service'].get_market_status()
-            last_scrape = services['scraping_service'].get_last_scrape_time()
-            
-            return jsonify({
-                'success': True,
-                'data': data,
-                'count': len(data),
-                'market_status': market_status,
-                'last_scrape': last_scrape.isoformat() if last_scrape else None,
-                'timestamp': datetime.now().isoformat(),
-                'flutter_ready': True,
-                'auth_info': {
-                    'key_type': request.auth_info['key_type'],
-                    'key_id': request.auth_info['key_id']
-                }
-            })
-        except Exception as e:
-            logger.error(f"Get stocks error: {e}")
-            return jsonify({
-                'success': False,
-                'error': str(e),
-                'flutter_ready': True
-            }), 500
-    
-    @app.route('/api/stocks/<symbol>', methods=['GET'])
-    @require_auth
-    def get_stock_by_symbol(symbol):
-        """Get specific stock data by symbol"""
-        try:
-            price_service = app.config['price_service']
+        symbol = request.args.get('symbol')
+        
+        if symbol:
             data = price_service.get_stock_by_symbol(symbol)
-            if data:
-                return jsonify({
-                    'success': True,
-                    'data': data,
-                    'market_status': price_service.get_market_status(),
-                    'timestamp': datetime.now().isoformat(),
-                    'flutter_ready': True
-                })
-            else:
+            if not data:
                 return jsonify({
                     'success': False,
-                    'error': f'Stock {symbol.upper()} not found',
+                    'error': 'Stock not found',
                     'flutter_ready': True
                 }), 404
-        except Exception as e:
-            return jsonify({
-                'success': False,
-                'error': str(e),
-                'flutter_ready': True
-            }), 500
+            data = [data]
+        else:
+            data = price_service.get_all_stocks()
+        
+        market_status = price_service.get_market_status()
+        last_scrape = scraping_service.get_last_scrape_time()
+        
+        return app.json.stream({
+            'success': True,
+            'data': data,
+            'count': len(data),
+            'market_status': market_status,
+            'last_scrape': last_scrape.isoformat() if last_scrape else None,
+            'timestamp': now_iso(),
+            'flutter_ready': True,
+            'auth_info': {
+                'key_type': request.auth_info['key_type'],
+                'key_id': request.auth_info['key_id']
+            }
+        }, 'data')
     
-    @app.route('/api/stocks/search', methods=['GET'])
+    @app.route('/api/stocks/<symbol>', methods=['GET'])
     @require_auth
-    def search_stocks():
-        """Search stocks"""
-        try:
-            price_service = app.config['price_service']
-            query = request.args.get('q', '').strip()
-            if not query or len(query) < 2:
-                return jsonify({
-                    'success': False,
-                    'error': 'Search query must be at least 2 characters',
-                    'flutter_ready': True
-                }), 400
-            
-            limit = min(int(request.args.get('limit', 20)), 100)
-            results = price_service.search_stocks(query, limit)
-            
+    def get_stock_by_symbol(symbol):
+        """Get specific stock data by symbol"""
+        data = price_service.get_stock_by_symbol(symbol)
+        if data:
             return jsonify({
                 'success': True,
-                'data': results,
-                'count': len(results),
-                'query': query,
-                'timestamp': datetime.now().isoformat(),
+                'data': data,
+                'market_status': price_service.get_market_status(),
+                'timestamp': now_iso(),
                 'flutter_ready': True
             })
-        except Exception as e:
+        else:
             return jsonify({
                 'success': False,
-                'error': str(e),
+                'error': f'Stock {symbol.upper()} not found',
                 'flutter_ready': True
-            }), 500
+            }), 404
     
-    @app.route('/api/stocks/gainers', methods=['GET'])
-    @require_auth
-    def get_top_gainers():
-        """Get top gaining stocks"""
-        try:
-            price_service = app.config['price_service']
-            limit = min(int(request.args.get('limit', 10)), 50)
-            gainers = price_service.get_top_gainers(limit)
-            
-            return jsonify({
-                'success': True,
-                'data': gainers,
-                'count': len(gainers),
-                'category': 'gainers',
-                'timestamp': datetime.now().isoformat(),
-                'flutter_ready': True
-            })
-        except Exception as e:
-            return jsonify({'success': False, 'error': str(e), 'flutter_ready': True}), 500
-    
-    @app.route('/api/stocks/losers', methods=['GET'])
+    @app.route('/api/stocks/search', methods=['GET'])
     @require_auth
-    def get_top_losers():
-        """Get top losing stocks"""
-        try:
-            price_service = app.config['price_service']
-            limit = min(int(request.args.get('limit', 10)), 50)
-            losers = price_service.get_top_losers(limit)
-            
+    def search_stocks():
+        """Search stocks"""
+        limit = parse_limit(20, 100)
+        
+        query = request.args.get('q', '').strip()
+        if not query or len(query) < 2:
             return jsonify({
-                'success': True,
-                'data': losers,
-                'count': len(losers),
-                'category': 'losers',
-                'timestamp': datetime.now().isoformat(),
+                'success': False,
+                'error': 'Search query must be at least 2 characters',
                 'flutter_ready': True
-            })
-        except Exception as e:
-            return jsonify({'success': False, 'error': str(e), 'flutter_ready': True}), 500
+            }), 400
+        
+        normalized = query.upper()
+        results = response_cache.memoize(
+            ('search_stocks', normalized, limit),
+            lambda: price_service.search_stocks(normalized, limit)
+        )
+        
+        return jsonify({
+            'success': True,
+            'data': results,
+            'count': len(results),
+            'query': query,
+            'timestamp': now_iso(),
+            'flutter_ready': True
+        })
     
-    @app.route('/api/stocks/active', methods=['GET'])
-    @require_auth
-    def get_most_active():
-        """Get most actively traded stocks"""
-        try:
-            price_service = app.config['price_service']
-            limit = min(int(request.args.get('limit', 10)), 50)
-            active = price_service.get_most_active(limit)
-            
-            return jsonify({
-                'success': True,
-                'data': active,
-                'count': len(active),
-                'category': 'active',
-                'timestamp': datetime.now().isoformat(),
-                'flutter_ready': True
-            })
-        except Exception as e:
-            return jsonify({'success': False, 'error': str(e), 'flutter_ready': True}), 500
+    for path, endpoint, fetch, category in (
+        ('/api/stocks/gainers', 'get_top_gainers', price_service.get_top_gainers, 'gainers'),
+        ('/api/stocks/losers', 'get_top_losers', price_service.get_top_losers, 'losers'),
+        ('/api/stocks/active', 'get_most_active', price_service.get_most_active, 'active')
+    ):
+        view = RankedStocksView.as_view(endpoint, fetch, category)
+        app.add_url_rule(path, view_func=require_auth(response_cache.cached(view)), methods=['GET'])
     
     @app.route('/api/market-summary', methods=['GET'])
     @require_auth
+    @response_cache.cached
     def get_market_summary():
         """Get market summary statistics"""
-        try:
-            price_service = app.config['price_service']
-            summary = price_service.get_market_summary()
-            return jsonify({
-                'success': True,
-                'data': summary,
-                'timestamp': datetime.now().isoformat(),
-                'flutter_ready': True
-            })
-        except Exception as e:
-            return jsonify({'success': False, 'error': str(e), 'flutter_ready': True}), 500
\ No newline at end of file
+        summary = price_service.get_market_summary()
+        return jsonify({
+            'success': True,
+            'data': summary,
+            'timestamp': now_iso(),
+            'flutter_ready': True
+        })
\ No newline at end of file
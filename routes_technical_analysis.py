@@ -1,8 +1,8 @@
 # routes_technical_analysis.py - Updated for 175 days
 
 import logging
-from datetime import datetime
 from flask import jsonify, request
+from clock import now_iso
 
 logger = logging.getLogger(__name__)
 
@@ -68,7 +68,7 @@ def register_technical_analysis_routes(app):
                 'current_price': analysis.get('current_price'),
                 'insights': analysis.get('insights', []),
                 'note': 'Support/Resistance levels calculated from 175 days data. Chart shows line data (no OHLC available).',  # Changed from 100
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': now_iso(),
                 'flutter_ready': True
             })
             
@@ -90,41 +90,32 @@ def register_technical_analysis_routes(app):
         Query params: days (7/30/175/365), window (optional)
         Note: S/R analysis always uses 175 days data
         """
-        try:
-            days = request.args.get('days', default=175, type=int)  # Changed from 100
-            window = request.args.get('window', type=int)
-            
-            if days not in VALID_DAYS:
-                return jsonify({
-                    'success': False,
-                    'error': f'Invalid days. Use: {", ".join(map(str, VALID_DAYS))}',
-                    'flutter_ready': True
-                }), 400
-            
-            analysis = technical_service.calculate_support_resistance(days, window)
-            
-            if 'error' in analysis:
-                return jsonify({
-                    'success': False,
-                    'error': analysis['error'],
-                    'flutter_ready': True
-                }), 500
-            
+        days = request.args.get('days', default=175, type=int)  # Changed from 100
+        window = request.args.get('window', type=int)
+        
+        if days not in VALID_DAYS:
             return jsonify({
-                'success': True,
-                'analysis': analysis,
-                'note': 'Support/Resistance calculated using 175 days data',  # Changed from 100
-                'timestamp': datetime.now().isoformat(),
+                'success': False,
+                'error': f'Invalid days. Use: {", ".join(map(str, VALID_DAYS))}',
                 'flutter_ready': True
-            })
-            
-        except Exception as e:
-            logger.error(f"Error in support-resistance endpoint: {e}")
+            }), 400
+        
+        analysis = technical_service.calculate_support_resistance(days, window)
+        
+        if 'error' in analysis:
             return jsonify({
                 'success': False,
-                'error': str(e),
+                'error': analysis['error'],
                 'flutter_ready': True
             }), 500
+        
+        return jsonify({
+            'success': True,
+            'analysis': analysis,
+            'note': 'Support/Resistance calculated using 175 days data',  # Changed from 100
+            'timestamp': now_iso(),
+            'flutter_ready': True
+        })
     
     @app.route('/api/analysis/detailed', methods=['GET'])
     @require_auth
@@ -133,40 +124,31 @@ def register_technical_analysis_routes(app):
         Get detailed technical analysis with insights
         Query params: days (7/30/175/365), window (optional)
         """
-        try:
-            days = request.args.get('days', default=175, type=int)  # Changed from 100
-            window = request.args.get('window', type=int)
-            
-            if days not in VALID_DAYS:
-                return jsonify({
-                    'success': False,
-                    'error': f'Invalid days. Use: {", ".join(map(str, VALID_DAYS))}',
-                    'flutter_ready': True
-                }), 400
-            
-            analysis = technical_service.get_detailed_analysis(days, window)
-            
-            if 'error' in analysis:
-                return jsonify({
-                    'success': False,
-                    'error': analysis['error'],
-                    'flutter_ready': True
-                }), 500
-            
+        days = request.args.get('days', default=175, type=int)  # Changed from 100
+        window = request.args.get('window', type=int)
+        
+        if days not in VALID_DAYS:
             return jsonify({
-                'success': True,
-                'analysis': analysis,
-                'timestamp': datetime.now().isoformat(),
+                'success': False,
+                'error': f'Invalid days. Use: {", ".join(map(str, VALID_DAYS))}',
                 'flutter_ready': True
-            })
-            
-        except Exception as e:
-            logger.error(f"Error in detailed analysis endpoint: {e}")
+            }), 400
+        
+        analysis = technical_service.get_detailed_analysis(days, window)
+        
+        if 'error' in analysis:
             return jsonify({
                 'success': False,
-                'error': str(e),
+                'error': analysis['error'],
                 'flutter_ready': True
             }), 500
+        
+        return jsonify({
+            'success': True,
+            'analysis': analysis,
+            'timestamp': now_iso(),
+            'flutter_ready': True
+        })
     
     @app.route('/api/analysis/summary', methods=['GET'])
     @require_auth
@@ -174,39 +156,30 @@ def register_technical_analysis_routes(app):
         """
         Get quick summary of all day periods
         """
-        try:
-            summary = {}
-            
-            for days in VALID_DAYS:
-                analysis = technical_service.calculate_support_resistance(days)
-                
-                if 'error' not in analysis:
-                    summary[f'{days}days'] = {
-                        'days': days,
-                        'current_price': analysis.get('current_price'),
-                        'support_count': len(analysis.get('support_levels', [])),
-                        'resistance_count': len(analysis.get('resistance_levels', [])),
-                        'nearest_support': analysis.get('nearest_support'),
-                        'nearest_resistance': analysis.get('nearest_resistance'),
-                        'price_range': analysis.get('price_range'),
-                        'data_points': analysis.get('data_points')
-                    }
-            
-            return jsonify({
-                'success': True,
-                'summary': summary,
-                'note': 'All S/R levels calculated from 175 days data',  # Changed from 100
-                'available_periods': VALID_DAYS,
-                'timestamp': datetime.now().isoformat(),
-                'flutter_ready': True
-            })
-            
-        except Exception as e:
-            logger.error(f"Error in summary endpoint: {e}")
-            return jsonify({
-                'success': False,
-                'error': str(e),
-                'flutter_ready': True
-            }), 500
+        summary = {}
+        
+        for days in VALID_DAYS:
+            analysis = technical_service.calculate_support_resistance(days)
+        
+            if 'error' not in analysis:
+                summary[f'{days}days'] = {
+                    'days': days,
+                    'current_price': analysis.get('current_price'),
+                    'support_count': len(analysis.get('support_levels', [])),
+                    'resistance_count': len(analysis.get('resistance_levels', [])),
+                    'nearest_support': analysis.get('nearest_support'),
+                    'nearest_resistance': analysis.get('nearest_resistance'),
+                    'price_range': analysis.get('price_range'),
+                    'data_points': analysis.get('data_points')
+                }
+        
+        return jsonify({
+            'success': True,
+            'summary': summary,
+            'note': 'All S/R levels calculated from 175 days data',  # Changed from 100
+            'available_periods': VALID_DAYS,
+            'timestamp': now_iso(),
+            'flutter_ready': True
+        })
     
     logger.info("✅ Technical analysis routes registered successfully with 175-day analysis")
\ No newline at end of file
@@ -1,15 +1,87 @@
 # scheduler.py - Smart Scheduler with EMA Signal Generation
 
+import atexit
 import logging
 import hashlib
 import json
+import struct
+import threading
+import concurrent.futures
 from datetime import datetime, time
+from itertools import chain
+from operator import itemgetter
+from time import monotonic
+from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED, EVENT_JOB_MISSED
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.triggers.cron import CronTrigger
-import pytz
+from zoneinfo import ZoneInfo
 
 logger = logging.getLogger(__name__)
 
+# Resolved once; every clock read and cron trigger shares the same zone object
+NEPAL_TZ = ZoneInfo('Asia/Kathmandu')
+
+# Seconds that cached scrape-info and market-open lookups stay valid
+SCRAPE_INFO_TTL = 30
+MARKET_OPEN_TTL = 30
+
+# Stocks (ordered by symbol) sampled for change detection, and the columns hashed
+HASH_SAMPLE_SIZE = 50
+HASH_SYMBOL = itemgetter('symbol')
+HASH_FIELDS = itemgetter('ltp', 'change', 'qty')
+
+# Buffered scrape results are written once this many are pending or this many seconds pass
+FLUSH_BATCH_SIZE = 8
+FLUSH_INTERVAL = 60
+
+# Worker threads for scheduled jobs; at most a few jobs ever overlap (3:02-3:10 PM)
+SCHEDULER_WORKERS = 3
+
+# Today's scrape counters, read by should_scrape_now and after each flush
+TODAY_SCRAPE_INFO_SQL = """
+    SELECT COUNT(*) as scrape_count, 
+           SUM(CASE WHEN data_changed = 0 THEN 1 ELSE 0 END) as no_change_count,
+           MAX(CASE WHEN market_detected_closed = 1 THEN 1 ELSE 0 END) as market_closed
+    FROM scheduler_history 
+    WHERE date = ?
+"""
+
+# One buffered scrape result; counters come from the rows already stored for that date.
+# Market is detected closed once 2+ earlier scrapes saw no change.
+INSERT_SCRAPE_RECORD_SQL = """
+    INSERT OR REPLACE INTO scheduler_history 
+    (date, scrape_time, data_hash, data_changed, scrape_count, market_detected_closed)
+    SELECT ?, ?, ?, ?, COUNT(*) + 1,
+           CASE WHEN COUNT(*) >= 2
+                 AND SUM(CASE WHEN data_changed = 0 THEN 1 ELSE 0 END) >= 2
+                THEN 1 ELSE 0 END
+    FROM scheduler_history 
+    WHERE date = ?
+"""
+
+# Running flag and next run times published by the one process that runs the jobs
+SCHEDULER_STATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS scheduler_state (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        running INTEGER NOT NULL,
+        next_runs TEXT,
+        updated_at TEXT NOT NULL
+    )
+"""
+
+# Status field for each job's next run time
+NEXT_RUN_STATUS_KEYS = (
+    ('market_scraper', 'next_stock_scrape'),
+    ('daily_price_save', 'next_price_save'),
+    ('ipo_scraper', 'next_ipo_scrape'),
+    ('ipo_notification', 'next_ipo_notification'),
+    ('nepse_history_scraper', 'next_nepse_history_scrape'),
+    ('nepse_history_scraper', 'next_ema_signal_generation'),
+    ('overview_cleanup', 'next_overview_cleanup')
+)
+
 
 class SmartScheduler:
     """Intelligent scheduler for market-aware scraping, IPO notifications, NEPSE history, market overview, price history, and EMA signals"""
@@ -26,13 +98,32 @@ class SmartScheduler:
         self.price_history_service = price_history_service
         self.ema_signal_service = ema_signal_service
         self.ema_notification_service = ema_notification_service
-        self.scheduler = BackgroundScheduler(timezone=pytz.timezone('Asia/Kathmandu'))
+        self.scheduler = BackgroundScheduler(
+            timezone=NEPAL_TZ,
+            jobstores={'default': MemoryJobStore()},
+            executors={'default': ThreadPoolExecutor(SCHEDULER_WORKERS)},
+            job_defaults={'coalesce': True, 'misfire_grace_time': 60}
+        )
+        # Next run times move after every job; republish them for the other workers
+        self.scheduler.add_listener(
+            self._on_job_event, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED
+        )
+        self._exit_hook_registered = False
         
         # Market configuration for Nepal (Sunday-Thursday, 11 AM - 3 PM)
-        self.market_days = [6, 0, 1, 2, 3]  # Sunday=6, Monday=0, ..., Thursday=3
+        self.market_days = frozenset((6, 0, 1, 2, 3))  # Sunday=6, Monday=0, ..., Thursday=3
         self.market_start_time = time(11, 0)  # 11:00 AM
         self.market_end_time = time(15, 0)    # 3:00 PM
-        self.nepal_tz = pytz.timezone('Asia/Kathmandu')
+        self.nepal_tz = NEPAL_TZ
+        
+        # Weekday x minute-of-day lookup: _market_minutes[weekday][hour * 60 + minute]
+        open_minute = self.market_start_time.hour * 60 + self.market_start_time.minute
+        close_minute = self.market_end_time.hour * 60 + self.market_end_time.minute
+        self._market_minutes = tuple(
+            bytes(weekday in self.market_days and open_minute <= minute < close_minute
+                  for minute in range(24 * 60))
+            for weekday in range(7)
+        )
         
         # Smart detection settings
         self.daily_scrape_count = 0
@@ -40,8 +131,27 @@ class SmartScheduler:
         self.last_data_hash = None
         self.market_closed_today = False
         
+        # Short-lived caches: (expires_at, date, info) and (expires_at, is_open)
+        self._scrape_info_cache = None
+        self._market_open_cache = None
+        
+        # Scrape results waiting to be written in batches (see FLUSH_BATCH_SIZE/FLUSH_INTERVAL)
+        self._pending_scrape_records = []
+        self._pending_lock = threading.Lock()
+        self._last_flush = monotonic()
+        # Writes them off the cron worker; one thread keeps flushes in order
+        self._record_writer = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='scheduler-writer'
+        )
+        
+        # Set by the app so scrapes can drop stale cached API responses
+        self.response_cache = None
+        
         # Initialize scheduler table
         self._init_scheduler_table()
+        
+        # Results still buffered when the process exits are written out
+        atexit.register(self._flush_scrape_records)
     
     def _init_scheduler_table(self):
         """Initialize table to track scraping history and market status"""
@@ -51,7 +161,6 @@ class SmartScheduler:
             
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS scheduler_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
                     date TEXT NOT NULL,
                     scrape_time TEXT NOT NULL,
                     data_hash TEXT,
@@ -59,10 +168,18 @@ class SmartScheduler:
                     scrape_count INTEGER DEFAULT 1,
                     market_detected_closed INTEGER DEFAULT 0,
                     created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(date, scrape_time)
-                )
+                    PRIMARY KEY (date, scrape_time)
+                ) WITHOUT ROWID
             """)
             
+            # Covers the per-date aggregate in _get_today_scrape_info/_record_scrape_result
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_scheduler_history_date 
+                ON scheduler_history (date, data_changed, market_detected_closed)
+            """)
+            
+            cursor.execute(SCHEDULER_STATE_TABLE_SQL)
+            
             conn.commit()
             conn.close()
             logger.info("Scheduler history table initialized")
@@ -72,7 +189,7 @@ class SmartScheduler:
     
     def _get_current_nepal_time(self):
         """Get current time in Nepal timezone"""
-        return datetime.now(self.nepal_tz)
+        return datetime.now(NEPAL_TZ)
     
     def _is_market_day(self, dt=None):
         """Check if given datetime (or now) is a market day"""
@@ -89,88 +206,135 @@ class SmartScheduler:
     
     def _is_market_open(self, dt=None):
         """Check if market should be open (market day + market hours)"""
-        return self._is_market_day(dt) and self._is_market_hours(dt)
+        if dt is not None:
+            return bool(self._market_minutes[dt.weekday()][dt.hour * 60 + dt.minute])
+        
+        # Status polling asks about "now" repeatedly; reuse a recent answer
+        cached = self._market_open_cache
+        if cached and cached[0] > monotonic():
+            return cached[1]
+        
+        dt = self._get_current_nepal_time()
+        is_open = bool(self._market_minutes[dt.weekday()][dt.hour * 60 + dt.minute])
+        self._market_open_cache = (monotonic() + MARKET_OPEN_TTL, is_open)
+        return is_open
     
     def _calculate_data_hash(self, stocks_data):
         """Calculate hash of current stock data to detect changes"""
         try:
-            data_for_hash = []
-            for stock in stocks_data[:50]:
-                data_for_hash.append({
-                    'symbol': stock.get('symbol', ''),
-                    'ltp': stock.get('ltp', 0),
-                    'change': stock.get('change', 0),
-                    'volume': stock.get('qty', 0)
-                })
-            
-            data_str = json.dumps(data_for_hash, sort_keys=True)
-            return hashlib.md5(data_str.encode()).hexdigest()
+            rows = stocks_data[:HASH_SAMPLE_SIZE]
+            
+            # Packed little-endian doubles into a 64-bit blake2b; no per-stock dict or JSON
+            digest = hashlib.blake2b('\x1f'.join(map(HASH_SYMBOL, rows)).encode(), digest_size=8)
+            values = [value or 0 for value in chain.from_iterable(map(HASH_FIELDS, rows))]
+            digest.update(struct.pack(f'<{len(values)}d', *values))
+            return digest.hexdigest()
             
         except Exception as e:
             logger.warning(f"Failed to calculate data hash: {e}")
             return None
     
-    def _get_today_scrape_info(self):
-        """Get today's scrape information"""
+    def _get_today_scrape_info(self, now=None):
+        """Get today's scrape information, including buffered results (stored counters cached for SCRAPE_INFO_TTL seconds)"""
         try:
-            today = self._get_current_nepal_time().date()
-            conn = self.db_service.get_connection()
-            cursor = conn.cursor()
+            today = (now or self._get_current_nepal_time()).date()
             
-            cursor.execute("""
-                SELECT COUNT(*) as scrape_count, 
-                       SUM(CASE WHEN data_changed = 0 THEN 1 ELSE 0 END) as no_change_count,
-                       MAX(CASE WHEN market_detected_closed = 1 THEN 1 ELSE 0 END) as market_closed
-                FROM scheduler_history 
-                WHERE date = ?
-            """, (today.isoformat(),))
-            
-            result = cursor.fetchone()
-            conn.close()
+            # Held across the read so a concurrent flush can't count a record twice or not at all
+            with self._pending_lock:
+                cached = self._scrape_info_cache
+                if cached and cached[0] > monotonic() and cached[1] == today:
+                    info = dict(cached[2])
+                else:
+                    conn = self.db_service.get_connection()
+                    cursor = conn.cursor()
+                    info = self._query_scrape_info(cursor, today)
+                    conn.close()
+                
+                date = today.isoformat()
+                pending = [record for record in self._pending_scrape_records if record[0] == date]
             
-            if result:
-                return {
-                    'scrape_count': result[0] or 0,
-                    'no_change_count': result[1] or 0,
-                    'market_closed': bool(result[2]) if result[2] is not None else False
-                }
-            else:
-                return {'scrape_count': 0, 'no_change_count': 0, 'market_closed': False}
+            return self._add_pending_records(info, pending)
                 
         except Exception as e:
             logger.error(f"Failed to get today's scrape info: {e}")
             return {'scrape_count': 0, 'no_change_count': 0, 'market_closed': False}
     
+    @staticmethod
+    def _add_pending_records(info, records):
+        """Count buffered results into stored counters, closing the market as INSERT_SCRAPE_RECORD_SQL does"""
+        for record in records:
+            if info['scrape_count'] >= 2 and info['no_change_count'] >= 2:
+                info['market_closed'] = True
+            info['scrape_count'] += 1
+            if not record[3]:
+                info['no_change_count'] += 1
+        return info
+    
+    def _query_scrape_info(self, cursor, today):
+        """Read today's counters on an open cursor and refresh the cached snapshot"""
+        cursor.execute(TODAY_SCRAPE_INFO_SQL, (today.isoformat(),))
+        
+        # An aggregate without GROUP BY always yields exactly one row; SUM/MAX are NULL on no rows
+        scrape_count, no_change_count, market_closed = cursor.fetchone()
+        info = {
+            'scrape_count': scrape_count,
+            'no_change_count': no_change_count or 0,
+            'market_closed': bool(market_closed)
+        }
+        
+        self._scrape_info_cache = (monotonic() + SCRAPE_INFO_TTL, today, info)
+        return dict(info)
+    
     def _record_scrape_result(self, data_changed, data_hash=None):
-        """Record the result of a scrape"""
-        try:
-            now = self._get_current_nepal_time()
-            today = now.date()
-            scrape_info = self._get_today_scrape_info()
-            
-            market_detected_closed = False
-            if scrape_info['scrape_count'] >= 2 and scrape_info['no_change_count'] >= 2:
-                market_detected_closed = True
-            
-            conn = self.db_service.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT OR REPLACE INTO scheduler_history 
-                (date, scrape_time, data_hash, data_changed, scrape_count, market_detected_closed)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                today.isoformat(), now.isoformat(), data_hash, int(data_changed), 
-                scrape_info['scrape_count'] + 1, int(market_detected_closed)
-            ))
-            
-            conn.commit()
-            conn.close()
+        """Buffer the result of a scrape; written out by _flush_scrape_records"""
+        now = self._get_current_nepal_time()
+        today = now.date().isoformat()
+        
+        with self._pending_lock:
+            self._pending_scrape_records.append(
+                (today, now.isoformat(), data_hash, int(data_changed), today)
+            )
+    
+    def _flush_due(self):
+        """Whether enough results are buffered, or enough time has passed, to write them out"""
+        with self._pending_lock:
+            return (len(self._pending_scrape_records) >= FLUSH_BATCH_SIZE
+                    or monotonic() - self._last_flush > FLUSH_INTERVAL)
+    
+    def _flush_scrape_records(self):
+        """Write buffered scrape results in one transaction and refresh today's counters"""
+        with self._pending_lock:
+            self._last_flush = monotonic()
+            records = self._pending_scrape_records
+            if not records:
+                return
             
-            self.market_closed_today = market_detected_closed
+            try:
+                conn = self.db_service.get_connection()
+                cursor = conn.cursor()
+                
+                # Records flushed together still see each other in order
+                cursor.executemany(INSERT_SCRAPE_RECORD_SQL, records)
+                
+                # Post-cycle snapshot read inside the same transaction as the write
+                scrape_info = self._query_scrape_info(cursor, self._get_current_nepal_time().date())
+                
+                conn.commit()
+                conn.close()
+                
+            except Exception as e:
+                # Kept buffered and retried on the next flush; rows are keyed by scrape time
+                self._scrape_info_cache = None
+                logger.error(f"Failed to record scrape results: {e}")
+                return
             
-        except Exception as e:
-            logger.error(f"Failed to record scrape result: {e}")
+            self._pending_scrape_records = []
+        
+        self.market_closed_today = scrape_info['market_closed']
+        
+        logger.info(f"Today's stats: {scrape_info['scrape_count']} scrapes, {scrape_info['no_change_count']} no-change")
+        if self.market_closed_today:
+            logger.info("Market detected as closed - future scrapes will be skipped today")
     
     def should_scrape_now(self):
         """Determine if scraping should happen now based on intelligent rules"""
@@ -180,7 +344,7 @@ class SmartScheduler:
             logger.info(f"Skipping scrape - outside market hours or not a market day")
             return False
         
-        scrape_info = self._get_today_scrape_info()
+        scrape_info = self._get_today_scrape_info(now)
         
         if scrape_info['market_closed']:
             logger.info(f"Skipping scrape - market detected as closed today")
@@ -209,26 +373,29 @@ class SmartScheduler:
             if not self.should_scrape_now():
                 return
             
-            current_stocks = self.price_service.get_all_stocks()
-            current_hash = self._calculate_data_hash(current_stocks)
+            # The previous cycle's post-scrape hash is this cycle's baseline,
+            # so only the post-scrape sample needs reading
+            current_hash = self.last_data_hash
+            if current_hash is None:
+                current_hash = self._calculate_data_hash(
+                    self.price_service.get_all_stocks(limit=HASH_SAMPLE_SIZE)
+                )
             
             logger.info("Performing scheduled stock data scrape...")
             stock_count = self.scraping_service.scrape_all_sources(force=True)
             
-            updated_stocks = self.price_service.get_all_stocks()
-            new_hash = self._calculate_data_hash(updated_stocks)
+            new_hash = self._calculate_data_hash(
+                self.price_service.get_all_stocks(limit=HASH_SAMPLE_SIZE)
+            )
+            self.last_data_hash = new_hash
             
             data_changed = current_hash != new_hash
             
             self._record_scrape_result(data_changed, new_hash)
+            self._invalidate_response_cache()
             
-            scrape_info = self._get_today_scrape_info()
             logger.info(f"Scheduled scrape completed: {stock_count} stocks processed")
             logger.info(f"Data changed: {data_changed}")
-            logger.info(f"Today's stats: {scrape_info['scrape_count']} scrapes, {scrape_info['no_change_count']} no-change")
-            
-            if self.market_closed_today:
-                logger.info("Market detected as closed - future scrapes will be skipped today")
             
             # Calculate and store market overview after scrape completes
             if data_changed:
@@ -236,6 +403,15 @@ class SmartScheduler:
             
         except Exception as e:
             logger.error(f"Scheduled scrape failed: {e}")
+        finally:
+            # Records buffered by the time the writer runs go out in one transaction
+            if self._flush_due():
+                self._record_writer.submit(self._flush_scrape_records)
+    
+    def _invalidate_response_cache(self):
+        """Drop cached API responses once freshly scraped data is saved"""
+        if self.response_cache is not None:
+            self.response_cache.invalidate()
     
     def scheduled_market_overview(self):
         """
@@ -288,6 +464,7 @@ class SmartScheduler:
             count = self.scraping_service.scrape_ipo_sources(force=False)
             
             if count > 0:
+                self._invalidate_response_cache()
                 logger.info(f"Daily IPO scrape completed successfully: {count} issues processed")
                 logger.info(f"  - Saved to separate tables: ipos, fpos, rights_dividends")
             else:
@@ -545,6 +722,10 @@ class SmartScheduler:
             )
             
             self.scheduler.start()
+            self._publish_state()
+            if not self._exit_hook_registered:
+                atexit.register(self._publish_stopped_on_exit)
+                self._exit_hook_registered = True
             logger.info("Intelligent scheduler started successfully")
             logger.info("Stock scrapes: Every 5 minutes during market hours (11 AM - 3 PM, Sun-Thu)")
             logger.info("Daily price save: 3:05 PM on market days (Sun-Thu) to persistent history")
@@ -553,12 +734,13 @@ class SmartScheduler:
             logger.info("NEPSE history + EMA signals: Daily at 3:10 PM (Sun-Thu)")
             logger.info("Market overview cleanup: Daily at 11:59 PM (Sun-Thu)")
             
-            next_scrape = self.scheduler.get_job('market_scraper').next_run_time
-            next_price_save = self.scheduler.get_job('daily_price_save').next_run_time
-            next_ipo_scrape = self.scheduler.get_job('ipo_scraper').next_run_time
-            next_ipo_notif = self.scheduler.get_job('ipo_notification').next_run_time
-            next_history = self.scheduler.get_job('nepse_history_scraper').next_run_time
-            next_cleanup = self.scheduler.get_job('overview_cleanup').next_run_time
+            next_runs = self._get_next_run_times()
+            next_scrape = next_runs.get('market_scraper')
+            next_price_save = next_runs.get('daily_price_save')
+            next_ipo_scrape = next_runs.get('ipo_scraper')
+            next_ipo_notif = next_runs.get('ipo_notification')
+            next_history = next_runs.get('nepse_history_scraper')
+            next_cleanup = next_runs.get('overview_cleanup')
             
             if next_scrape:
                 logger.info(f"Next stock scrape: {next_scrape.strftime('%Y-%m-%d %H:%M:%S %Z')}")
@@ -577,17 +759,84 @@ class SmartScheduler:
             logger.error(f"Failed to start scheduler: {e}")
             raise
     
+    def _get_next_run_times(self):
+        """Map job id to next run time with a single pass over the in-memory job store"""
+        return {job.id: job.next_run_time for job in self.scheduler.get_jobs()}
+    
+    def _get_next_run_isoformats(self):
+        """Next run time of each scheduled job as an ISO string"""
+        return {
+            job_id: next_run.isoformat()
+            for job_id, next_run in self._get_next_run_times().items()
+            if next_run
+        }
+    
+    def _publish_state(self):
+        """Store this process's running flag and next run times for the other workers"""
+        running = self.scheduler.running
+        next_runs = self._get_next_run_isoformats() if running else {}
+        
+        try:
+            conn = self.db_service.get_connection()
+            conn.execute(
+                """INSERT OR REPLACE INTO scheduler_state (id, running, next_runs, updated_at)
+                   VALUES (1, ?, ?, ?)""",
+                (int(running), json.dumps(next_runs), self._get_current_nepal_time().isoformat())
+            )
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Failed to publish scheduler state: {e}")
+    
+    def _get_published_state(self):
+        """Running flag and next run times (ISO strings) published by the scheduling process"""
+        try:
+            conn = self.db_service.get_connection()
+            row = conn.execute(
+                'SELECT running, next_runs FROM scheduler_state WHERE id = 1'
+            ).fetchone()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Failed to read scheduler state: {e}")
+            return False, {}
+        
+        if not row:
+            return False, {}
+        return bool(row[0]), json.loads(row[1] or '{}')
+    
+    def _on_job_event(self, event):
+        """Republish next run times once a job has run, failed or been skipped"""
+        self._publish_state()
+    
+    def _publish_stopped_on_exit(self):
+        """Mark the scheduler stopped when the process running it exits"""
+        if self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
+            self._publish_state()
+    
     def stop(self):
         """Stop the scheduler"""
         if self.scheduler.running:
             self.scheduler.shutdown()
+            self._publish_state()
             logger.info("Intelligent scheduler stopped")
+        # Nothing buffered should be lost on shutdown
+        self._flush_scrape_records()
     
     def get_scheduler_status(self):
         """Get current scheduler status for API"""
         try:
+            now = self._get_current_nepal_time()
+            today_scrape_info = self._get_today_scrape_info(now)
+            
+            # Jobs run in a single worker; the rest report the state it published
+            if self.scheduler.running:
+                running, next_runs = True, self._get_next_run_isoformats()
+            else:
+                running, next_runs = self._get_published_state()
+            
             status = {
-                'scheduler_running': self.scheduler.running if hasattr(self, 'scheduler') else False,
+                'scheduler_running': running,
                 'next_stock_scrape': None,
                 'next_price_save': None,
                 'next_ipo_scrape': None,
@@ -595,33 +844,15 @@ class SmartScheduler:
                 'next_nepse_history_scrape': None,
                 'next_ema_signal_generation': None,
                 'next_overview_cleanup': None,
-                'current_nepal_time': self._get_current_nepal_time().isoformat(),
+                'current_nepal_time': now.isoformat(),
                 'market_currently_open': self._is_market_open(),
-                'today_scrape_info': self._get_today_scrape_info(),
-                'market_detected_closed_today': self.market_closed_today
+                'today_scrape_info': today_scrape_info,
+                'market_detected_closed_today': today_scrape_info['market_closed']
             }
             
-            if self.scheduler.running:
-                stock_job = self.scheduler.get_job('market_scraper')
-                price_save_job = self.scheduler.get_job('daily_price_save')
-                ipo_scrape_job = self.scheduler.get_job('ipo_scraper')
-                ipo_notif_job = self.scheduler.get_job('ipo_notification')
-                history_job = self.scheduler.get_job('nepse_history_scraper')
-                cleanup_job = self.scheduler.get_job('overview_cleanup')
-                
-                if stock_job and stock_job.next_run_time:
-                    status['next_stock_scrape'] = stock_job.next_run_time.isoformat()
-                if price_save_job and price_save_job.next_run_time:
-                    status['next_price_save'] = price_save_job.next_run_time.isoformat()
-                if ipo_scrape_job and ipo_scrape_job.next_run_time:
-                    status['next_ipo_scrape'] = ipo_scrape_job.next_run_time.isoformat()
-                if ipo_notif_job and ipo_notif_job.next_run_time:
-                    status['next_ipo_notification'] = ipo_notif_job.next_run_time.isoformat()
-                if history_job and history_job.next_run_time:
-                    status['next_nepse_history_scrape'] = history_job.next_run_time.isoformat()
-                    status['next_ema_signal_generation'] = history_job.next_run_time.isoformat()
-                if cleanup_job and cleanup_job.next_run_time:
-                    status['next_overview_cleanup'] = cleanup_job.next_run_time.isoformat()
+            if running:
+                for job_id, status_key in NEXT_RUN_STATUS_KEYS:
+                    status[status_key] = next_runs.get(job_id)
             
             return status
             
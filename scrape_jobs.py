@@ -0,0 +1,178 @@
+# scrape_jobs.py - Background queue for manually triggered scrapes
+
+import json
+import logging
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Finished jobs kept around for status polling
+MAX_FINISHED_JOBS = 50
+
+JOB_COLUMNS = ('job_id', 'scrape_type', 'force', 'status', 'results', 'total_count',
+               'error', 'queued_at', 'started_at', 'finished_at')
+
+
+class ScrapeJobQueue:
+    """Runs trigger-scrape requests one at a time off the request thread
+
+    Job records are also written to the data database so a status poll
+    answered by a different gunicorn worker still finds them.
+    """
+
+    def __init__(self, scraping_service, db_service, response_cache=None):
+        self.scraping_service = scraping_service
+        self.db_service = db_service
+        self.response_cache = response_cache
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='scrape-job')
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._init_jobs_table()
+
+    def _init_jobs_table(self):
+        try:
+            conn = self.db_service.get_connection()
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS scrape_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    scrape_type TEXT NOT NULL,
+                    force INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    results TEXT,
+                    total_count INTEGER,
+                    error TEXT,
+                    queued_at TEXT NOT NULL,
+                    started_at TEXT,
+                    finished_at TEXT
+                )
+            ''')
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Error creating scrape_jobs table: {e}")
+
+    def submit(self, scrape_type='all', force=True):
+        """Queue a scrape and return its job record; identical queued requests share one job"""
+        with self._lock:
+            for job in self._jobs.values():
+                if (job['status'] == 'queued' and job['scrape_type'] == scrape_type
+                        and job['force'] == force):
+                    return dict(job)
+
+            job = {
+                'job_id': secrets.token_hex(8),
+                'scrape_type': scrape_type,
+                'force': force,
+                'status': 'queued',
+                'results': None,
+                'total_count': None,
+                'error': None,
+                'queued_at': datetime.now().isoformat(),
+                'started_at': None,
+                'finished_at': None
+            }
+            self._jobs[job['job_id']] = job
+            self._prune()
+            snapshot = dict(job)
+
+        self._save(snapshot)
+        self._executor.submit(self._run, job['job_id'])
+        logger.info(f"Queued {scrape_type} scrape job {job['job_id']}")
+        return snapshot
+
+    def get(self, job_id):
+        """Get a copy of a job record, or None if unknown"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job:
+                return dict(job)
+        return self._load(job_id)
+
+    def _run(self, job_id):
+        with self._lock:
+            job = self._jobs[job_id]
+            job['status'] = 'running'
+            job['started_at'] = datetime.now().isoformat()
+            scrape_type, force = job['scrape_type'], job['force']
+            snapshot = dict(job)
+        self._save(snapshot)
+
+        stock_count = ipo_count = 0
+        error = None
+        try:
+            if scrape_type in ['stocks', 'all']:
+                stock_count = self.scraping_service.scrape_all_sources(force=force)
+
+            if scrape_type in ['issues', 'ipos', 'all']:
+                ipo_count = self.scraping_service.scrape_ipo_sources(force=force)
+
+            if self.response_cache is not None:
+                self.response_cache.invalidate()
+        except Exception as e:
+            logger.error(f"Scrape job {job_id} failed: {e}")
+            error = str(e)
+
+        results = {'stocks': stock_count, 'issues': ipo_count}
+        with self._lock:
+            job['results'] = results
+            job['total_count'] = stock_count + ipo_count
+            job['error'] = error
+            job['status'] = 'failed' if error else 'completed'
+            job['finished_at'] = datetime.now().isoformat()
+            snapshot = dict(job)
+        self._save(snapshot)
+
+        logger.info(f"Scrape job {job_id} {job['status']}: {results}")
+
+    def _save(self, job):
+        try:
+            conn = self.db_service.get_connection()
+            row = dict(job, force=int(job['force']),
+                       results=json.dumps(job['results']) if job['results'] is not None else None)
+            conn.execute(
+                f"INSERT OR REPLACE INTO scrape_jobs ({', '.join(JOB_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(JOB_COLUMNS))})",
+                [row[column] for column in JOB_COLUMNS]
+            )
+            if job['status'] == 'queued':
+                conn.execute('''
+                    DELETE FROM scrape_jobs
+                    WHERE status IN ('completed', 'failed')
+                    AND job_id NOT IN (
+                        SELECT job_id FROM scrape_jobs
+                        WHERE status IN ('completed', 'failed')
+                        ORDER BY queued_at DESC
+                        LIMIT ?
+                    )
+                ''', (MAX_FINISHED_JOBS,))
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Could not persist scrape job {job['job_id']}: {e}")
+
+    def _load(self, job_id):
+        try:
+            conn = self.db_service.get_connection()
+            row = conn.execute(
+                f"SELECT {', '.join(JOB_COLUMNS)} FROM scrape_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Could not read scrape job {job_id}: {e}")
+            return None
+
+        if not row:
+            return None
+        job = dict(zip(JOB_COLUMNS, row))
+        job['force'] = bool(job['force'])
+        job['results'] = json.loads(job['results']) if job['results'] else None
+        return job
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items()
+                    if job['status'] in ('completed', 'failed')]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
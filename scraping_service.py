@@ -16,18 +16,31 @@ from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
+# Last successful scrape of each kind, shared by every worker process
+SCRAPE_STATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS scrape_state (
+        name TEXT PRIMARY KEY,
+        scraped_at TEXT NOT NULL
+    ) WITHOUT ROWID
+"""
+
 class EnhancedScrapingService:
     """Enhanced scraping service with stock, IPO, and market indices support"""
     
-    def __init__(self, price_service, ipo_service, index_service=None):
+    def __init__(self, price_service, ipo_service, index_service=None, db_service=None):
         self.price_service = price_service
         self.ipo_service = ipo_service
         self.index_service = index_service
+        self.db_service = db_service
         self.last_scrape_time = None
         self.last_ipo_scrape_time = None
         self.last_index_scrape_time = None
         self.scrape_lock = threading.Lock()
         
+        # Only one process scrapes; the others read its scrape times from the database
+        if self.db_service is not None:
+            self._init_state_table()
+        
         # Stock data sources
         self.stock_sources = [
             {
@@ -142,7 +155,7 @@ class EnhancedScrapingService:
                     if indices and len(indices) >= 5:
                         count = self.index_service.save_indices(indices, source['name'])
                         if count > 0:
-                            self.last_index_scrape_time = datetime.now()
+                            self.last_index_scrape_time = self._mark_scraped('index')
                             logger.info(f"Successfully scraped {count} market indices")
                             return count
                     else:
@@ -305,7 +318,7 @@ class EnhancedScrapingService:
                     continue
             
             if total_saved > 0:
-                self.last_ipo_scrape_time = datetime.now()
+                self.last_ipo_scrape_time = self._mark_scraped('ipo')
                 logger.info(f"IPO scraping completed. Total saved: {total_saved} issues across separate tables")
                 for scrape in successful_scrapes:
                     logger.info(f"  {scrape['type']}: {scrape['count']} issues in '{scrape['table']}' table")
@@ -713,7 +726,7 @@ class EnhancedScrapingService:
                     continue
             
             if successful_scrapes:
-                self.last_scrape_time = datetime.now()
+                self.last_scrape_time = self._mark_scraped('stock')
                 logger.info(f"Stock scraping completed successfully. {total_stocks} stocks updated.")
                 return total_stocks
             else:
@@ -897,22 +910,70 @@ class EnhancedScrapingService:
             'indices': index_count,
             'ipos': ipo_count,
             'total': stock_count + index_count + ipo_count,
-            'last_stock_scrape': self.last_scrape_time,
-            'last_index_scrape': self.last_index_scrape_time,
-            'last_ipo_scrape': self.last_ipo_scrape_time
+            'last_stock_scrape': self.get_last_scrape_time(),
+            'last_index_scrape': self.get_last_index_scrape_time(),
+            'last_ipo_scrape': self.get_last_ipo_scrape_time()
         }
     
+    # ==================== SHARED SCRAPE STATE ====================
+    
+    def _init_state_table(self):
+        """Create the table holding the last successful scrape of each kind"""
+        try:
+            conn = self.db_service.get_connection()
+            conn.execute(SCRAPE_STATE_TABLE_SQL)
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Failed to initialize scrape state table: {e}")
+    
+    def _mark_scraped(self, name):
+        """Record a successful scrape for every worker process and return its time"""
+        scraped_at = datetime.now()
+        if self.db_service is None:
+            return scraped_at
+        
+        try:
+            conn = self.db_service.get_connection()
+            conn.execute(
+                'INSERT OR REPLACE INTO scrape_state (name, scraped_at) VALUES (?, ?)',
+                (name, scraped_at.isoformat())
+            )
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Failed to record {name} scrape time: {e}")
+        
+        return scraped_at
+    
+    def _get_scraped_at(self, name, local_value):
+        """Last successful scrape by any process, falling back to this process's own"""
+        if self.db_service is None:
+            return local_value
+        
+        try:
+            conn = self.db_service.get_connection()
+            row = conn.execute(
+                'SELECT scraped_at FROM scrape_state WHERE name = ?', (name,)
+            ).fetchone()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Failed to read {name} scrape time: {e}")
+            return local_value
+        
+        return datetime.fromisoformat(row[0]) if row else local_value
+    
     def get_last_scrape_time(self):
         """Get the timestamp of last successful stock scrape"""
-        return self.last_scrape_time
+        return self._get_scraped_at('stock', self.last_scrape_time)
     
     def get_last_index_scrape_time(self):
         """Get the timestamp of last successful index scrape"""
-        return self.last_index_scrape_time
+        return self._get_scraped_at('index', self.last_index_scrape_time)
     
     def get_last_ipo_scrape_time(self):
         """Get the timestamp of last successful IPO scrape"""
-        return self.last_ipo_scrape_time
+        return self._get_scraped_at('ipo', self.last_ipo_scrape_time)
 
 
 class DataValidator:
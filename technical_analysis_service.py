@@ -5,7 +5,6 @@ import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from scipy.signal import argrelextrema
-from sklearn.cluster import KMeans
 
 logger = logging.getLogger(__name__)
 
@@ -84,22 +83,35 @@ class TechnicalAnalysisService:
         
         return min_idx, max_idx
     
-    def _count_touches(self, zone_level, prices, price_range):
+    def _count_touches(self, zone_levels, prices, price_range):
         """
-        Count how many times price touched a zone
+        Count how many times price touched each zone
         
         Parameters:
-        - zone_level: The price level of the zone
+        - zone_levels: Array of zone price levels
         - prices: Array of all prices
         - price_range: Total price range
         
         Returns:
-        - Number of touches
+        - Array with the number of touches for each zone
         """
-        # Count touches within 1% of price range
+        # Count touches within 1% of price range, for every zone in one pass
         touch_threshold = price_range * 0.01
-        touches = np.sum(np.abs(prices - zone_level) < touch_threshold)
-        return int(touches)
+        distances = np.abs(prices[np.newaxis, :] - zone_levels[:, np.newaxis])
+        return np.sum(distances < touch_threshold, axis=1)
+    
+    def _zone_points(self, prices, indices, price_range):
+        """Build unmerged zone points for the extrema at the given indices"""
+        levels = prices[indices].astype(np.float64)
+        touches = self._count_touches(levels, prices, price_range)
+        return [
+            {
+                'level': level,
+                'touches': touch_count,
+                'strength': 0.0  # Will be recalculated
+            }
+            for level, touch_count in zip(levels.tolist(), touches.tolist())
+        ]
     
     def _merge_nearby_levels(self, levels, price_range):
         """
@@ -179,24 +191,9 @@ class TechnicalAnalysisService:
             maxPrice = float(df['index_value'].max())
             priceRange = maxPrice - minPrice
             
-            # Extract support and resistance values with their indices
-            support_points = [
-                {
-                    'level': float(df.iloc[i]['index_value']),
-                    'touches': self._count_touches(df.iloc[i]['index_value'], prices, priceRange),
-                    'strength': 0.0  # Will be recalculated
-                }
-                for i in min_idx
-            ]
-            
-            resistance_points = [
-                {
-                    'level': float(df.iloc[i]['index_value']),
-                    'touches': self._count_touches(df.iloc[i]['index_value'], prices, priceRange),
-                    'strength': 0.0  # Will be recalculated
-                }
-                for i in max_idx
-            ]
+            # Extract support and resistance values with their touch counts
+            support_points = self._zone_points(prices, min_idx, priceRange)
+            resistance_points = self._zone_points(prices, max_idx, priceRange)
             
             # Merge nearby levels
             support_points = self._merge_nearby_levels(support_points, priceRange)